@@ -0,0 +1,10 @@
+import os
+
+# Requests mostly wait on upstream I/O, so each worker serves them from a
+# thread pool; long-lived streaming responses hold a thread each.
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "300"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
@@ -2,9 +2,12 @@ import logging
 import os
 import secrets
 from pathlib import Path
+from typing import Any
 
+import orjson
 from dotenv import load_dotenv
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -16,8 +19,25 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    sort_keys = False
+    compact = True
+    options = (
+        orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = self.options | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
 # App configuration
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.wsgi_app = ProxyFix(app.wsgi_app)
 
 # Version information
@@ -39,11 +59,20 @@ BYPASS_OLLAMA_RAG = os.getenv("BYPASS_OLLAMA_RAG", "false").lower() == "true"
 
 DEBUG = os.getenv("DEBUG", "true").lower() == "true"
 
+# Seconds to reuse non-streaming replies for identical requests (0 disables)
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "0"))
+
 # Rate limiting configuration
 DAILY_LIMIT = int(os.getenv("DAILY_RATE_LIMIT", "86400"))
 MINUTE_LIMIT = int(os.getenv("MINUTE_RATE_LIMIT", "60"))
 STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE", "memory://")
 
+if STORAGE_URI.startswith("memory://") and int(os.getenv("GUNICORN_WORKERS", "1")) > 1:
+    logger.warning(
+        "Rate limits use in-memory storage and are enforced per worker; "
+        "set RATE_LIMIT_STORAGE to a Redis URI to share them across workers"
+    )
+
 limiter = Limiter(
     key_func=get_remote_address,
     app=app,
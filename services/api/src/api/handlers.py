@@ -1,16 +1,55 @@
+import hashlib
 import json
 import queue
 import threading
 import time
+from collections import OrderedDict
+from dataclasses import astuple
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import elasticsearch
-from api.config import DEBUG, logger
+import orjson
+from api.config import DEBUG, RESPONSE_CACHE_TTL, logger
 from core.pipeline_config import QueryPipelineConfig
-from core.rag_pipeline import RAGQueryPipeline
+from core.rag_pipeline import get_rag_pipeline
 from flask import Response, jsonify, stream_with_context
 
+RESPONSE_CACHE_SIZE = 256
+
+# (config, conversation digest) -> (expires_at, response)
+_response_cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _response_cache_key(
+    config: QueryPipelineConfig, query: str, conversation: List[Dict[str, str]]
+) -> Tuple:
+    digest = hashlib.blake2b(
+        orjson.dumps([conversation, query]), digest_size=16
+    ).digest()
+    return astuple(config), digest
+
+
+def _get_cached_response(key: Tuple) -> Optional[Dict[str, Any]]:
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic():
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return cached[1]
+
+
+def _store_cached_response(key: Tuple, response: Dict[str, Any]) -> None:
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, response)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
 
 def format_stream_response(
     config: QueryPipelineConfig,
@@ -88,13 +127,13 @@ def handle_streaming_response(
     options: Optional[Dict[str, Any]] = None,
 ) -> Response:
     q = queue.Queue()
-    start_time = time.time_ns()
+    start_time = time.perf_counter_ns()
     prompt_start = None
 
     def streaming_callback(chunk):
         nonlocal prompt_start
         if prompt_start is None:
-            prompt_start = time.time_ns()
+            prompt_start = time.perf_counter_ns()
 
         if chunk.content:
             if format_schema and chunk.is_final:
@@ -118,18 +157,18 @@ def handle_streaming_response(
                     tool_calls=getattr(chunk, "tool_calls", None),
                 )
 
-            q.put(json.dumps(response_data) + "\n")
+            q.put(response_data)
 
-    rag = RAGQueryPipeline(config=config, streaming_callback=streaming_callback)
+    rag = get_rag_pipeline(config, streaming=True)
 
     def run_rag():
         try:
             # Track model loading
-            load_start = time.time_ns()
+            load_start = time.perf_counter_ns()
             for status in rag.initialize_and_check_models():
                 # Handle model pull status
                 if status_data := format_model_status(status, config):
-                    q.put(json.dumps(status_data) + "\n")
+                    q.put(status_data)
 
                 if status.get("status") == "error":
                     error_data = format_stream_response(
@@ -138,17 +177,20 @@ def handle_streaming_response(
                         done=True,
                         done_reason="error",
                     )
-                    q.put(json.dumps(error_data) + "\n")
+                    q.put(error_data)
                     return
 
-            load_duration = time.time_ns() - load_start
+            load_duration = time.perf_counter_ns() - load_start
 
             response_text = rag.run_query(
-                query=query, conversation=conversation, print_response=DEBUG
+                query=query,
+                conversation=conversation,
+                print_response=DEBUG,
+                streaming_callback=streaming_callback,
             )
 
             # Calculate final metrics
-            end_time = time.time_ns()
+            end_time = time.perf_counter_ns()
             final_data = format_stream_response(
                 config,
                 done=True,
@@ -157,12 +199,12 @@ def handle_streaming_response(
                 load_duration=load_duration,
                 prompt_eval_count=len(conversation) + 1,
                 prompt_eval_duration=end_time - (prompt_start or start_time),
-                eval_count=len(response_text.split())
-                if response_text is not None
-                else 0,
+                eval_count=(
+                    len(response_text.split()) if response_text is not None else 0
+                ),
                 eval_duration=end_time - (prompt_start or start_time),
             )
-            q.put(json.dumps(final_data) + "\n")
+            q.put(final_data)
 
         except elasticsearch.BadRequestError as e:
             error_data = format_stream_response(
@@ -171,14 +213,14 @@ def handle_streaming_response(
                 done=True,
                 done_reason="error",
             )
-            q.put(json.dumps(error_data) + "\n")
+            q.put(error_data)
 
         except Exception as e:
             error_data = format_stream_response(
                 config, content=f"Error: {str(e)}", done=True, done_reason="error"
             )
             logger.error(f"Error in RAG pipeline: {e}", exc_info=True)
-            q.put(json.dumps(error_data) + "\n")
+            q.put(error_data)
 
     thread = threading.Thread(target=run_rag, daemon=True)
     thread.start()
@@ -187,23 +229,22 @@ def handle_streaming_response(
         while True:
             try:
                 data = q.get(timeout=120)
-                if data:
-                    yield data
+                yield orjson.dumps(data) + b"\n"
 
-                if '"done": true' in data:
+                if data.get("done"):
                     logger.info("Streaming completed.")
                     break
 
             except queue.Empty:
                 # Send an empty object for heartbeat
-                yield json.dumps({}) + "\n"
+                yield b"{}\n"
                 logger.warning("Queue timeout. Sending heartbeat.")
             except Exception as e:
                 logger.error(f"Streaming error: {e}")
                 error_data = format_stream_response(
                     config, "Streaming error occurred.", done=True, done_reason="error"
                 )
-                yield json.dumps(error_data) + "\n"
+                yield orjson.dumps(error_data) + b"\n"
                 break
 
     return Response(
@@ -224,28 +265,45 @@ def handle_standard_response(
     format_schema: Optional[Dict[str, Any]] = None,
     options: Optional[Dict[str, Any]] = None,
 ) -> Response:
-    start_time = time.time_ns()
-    rag = RAGQueryPipeline(config=config)
+    start_time = time.perf_counter_ns()
+    created_at = datetime.now(timezone.utc).isoformat()
+
+    cache_key = None
+    if RESPONSE_CACHE_TTL > 0:
+        cache_key = _response_cache_key(config, query, conversation)
+        if cached := _get_cached_response(cache_key):
+            logger.info("Returning cached response")
+            # Timing fields describe this request, not the one that filled the cache
+            return jsonify(
+                {
+                    **cached,
+                    "created_at": created_at,
+                    "total_duration": time.perf_counter_ns() - start_time,
+                    "load_duration": 0,
+                }
+            )
+
+    rag = get_rag_pipeline(config)
 
     try:
         # Track model loading time
-        load_start = time.time_ns()
+        load_start = time.perf_counter_ns()
         for status in rag.initialize_and_check_models():
             if status.get("status") == "error":
                 raise Exception(f"Model initialization failed: {status.get('error')}")
-        load_duration = time.time_ns() - load_start
+        load_duration = time.perf_counter_ns() - load_start
 
         # Track query execution time
-        prompt_start = time.time_ns()
+        prompt_start = time.perf_counter_ns()
         result = rag.run_query(
             query=query, conversation=conversation, print_response=False
         )
-        end_time = time.time_ns()
+        end_time = time.perf_counter_ns()
         response_content = result
         eval_count = len(response_content.split()) if response_content else 0
         response = {
             "model": config.model_name,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": created_at,
             "message": {"role": "assistant", "content": response_content},
             "done": True,
             "done_reason": "stop",
@@ -257,6 +315,9 @@ def handle_standard_response(
             "eval_duration": end_time - prompt_start,
         }
 
+        if cache_key is not None:
+            _store_cached_response(cache_key, response)
+
         logger.info(f"returning: {response}")
         return jsonify(response)
 
@@ -264,7 +325,7 @@ def handle_standard_response(
         logger.error(f"Error in RAG pipeline: {e}", exc_info=True)
         error_response = {
             "model": config.model_name,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": created_at,
             "done": True,
             "done_reason": "error",
             "error": "An internal error has occurred. Please try again later.",
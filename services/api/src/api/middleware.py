@@ -1,9 +1,22 @@
+import hmac
 import os
 from functools import wraps
 
 from api.config import API_KEY, app, logger
 from flask import abort, request
 
+API_KEY_BYTES = API_KEY.encode()
+REQUIRE_API_KEY = os.getenv("REQUIRE_API_KEY", "true").lower() == "true"
+
+SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("X-XSS-Protection", "1; mode=block"),
+    ("Content-Security-Policy", "default-src 'self'"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+)
+HSTS_HEADER = ("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
+
 
 def get_token_from_header():
     auth_header = request.headers.get("Authorization")
@@ -17,13 +30,15 @@ def get_token_from_header():
     return parts[1]
 
 
+def is_valid_key(key: str) -> bool:
+    """Compare a client-supplied key against API_KEY in constant time."""
+    return hmac.compare_digest(key.encode(), API_KEY_BYTES)
+
+
 def require_api_key(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        require_api_key = os.getenv("REQUIRE_API_KEY", "true")
-        require_api_key = require_api_key.lower() == "true"
-
-        if not require_api_key:
+        if not REQUIRE_API_KEY:
             return f(*args, **kwargs)
 
         api_key = request.headers.get("X-API-Key")
@@ -31,8 +46,8 @@ def require_api_key(f):
 
         if (
             not (api_key or bearer_token)
-            or (api_key and api_key != API_KEY)
-            or (bearer_token and bearer_token != API_KEY)
+            or (api_key and not is_valid_key(api_key))
+            or (bearer_token and not is_valid_key(bearer_token))
         ):
             logger.warning(f"Invalid authentication attempt from {request.remote_addr}")
             abort(401, description="Invalid or missing authentication")
@@ -57,16 +72,10 @@ def setup_security_middleware(app):
 
     @app.after_request
     def after_request(response):
-        response.headers.update(
-            {
-                "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-                "X-Content-Type-Options": "nosniff",
-                "X-Frame-Options": "DENY",
-                "X-XSS-Protection": "1; mode=block",
-                "Content-Security-Policy": "default-src 'self'",
-                "Referrer-Policy": "strict-origin-when-cross-origin",
-            }
-        )
+        response.headers.extend(SECURITY_HEADERS)
+        # HSTS is ignored by browsers over plain HTTP, so only send it on HTTPS.
+        if request.is_secure:
+            response.headers.add(*HSTS_HEADER)
 
         if os.getenv("ENABLE_CORS", "False").lower() == "true":
             allowed_origins = os.getenv("CORS_ALLOWED_ORIGINS", "*")
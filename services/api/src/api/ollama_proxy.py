@@ -4,6 +4,7 @@ import os
 from typing import Optional
 
 import requests
+from core.http_session import get_ollama_session
 from flask import Response, request, stream_with_context
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class OllamaProxy:
                      OLLAMA_URL or 'http://localhost:11434'
         """
         self.base_url = base_url or os.getenv("OLLAMA_URL", "http://localhost:11434")
+        self.http = get_ollama_session()
 
     def _proxy_request(
         self, path: str, method: str = "GET", stream: bool = False
@@ -49,10 +51,10 @@ class OllamaProxy:
             if k.lower() not in ["host", "transfer-encoding"]
         }
 
-        data = request.get_data() if method != "GET" else None
+        data = request.get_data(cache=False) if method != "GET" else None
 
         try:
-            response = requests.request(
+            response = self.http.request(
                 method=method, url=url, headers=headers, data=data, stream=stream
             )
 
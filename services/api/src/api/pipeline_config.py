@@ -1,3 +1,4 @@
+import logging
 import os
 from dataclasses import dataclass
 from enum import Enum
@@ -177,11 +178,12 @@ def create_pipeline_config(
     # Add Elasticsearch config
     config.update(get_elasticsearch_config(index))
 
-    logger.info("\nPipeline Configuration:")
-    for key, value in sorted(config.items()):
-        if any(sensitive in key.lower() for sensitive in ["password", "key", "auth"]):
-            logger.info(f"  {key}: ****")
-        else:
-            logger.info(f"  {key}: {value}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\nPipeline Configuration:")
+        for key, value in sorted(config.items()):
+            if any(s in key.lower() for s in ["password", "key", "auth"]):
+                logger.info("  %s: ****", key)
+            else:
+                logger.info("  %s: %s", key, value)
 
     return QueryPipelineConfig(**config)
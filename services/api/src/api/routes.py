@@ -1,6 +1,7 @@
 import json
 from datetime import datetime, timezone
 
+import orjson
 from api.config import (
     ALLOW_INDEX_CHANGE,
     ALLOW_MODEL_CHANGE,
@@ -15,6 +16,7 @@ from api.handlers import handle_standard_response, handle_streaming_response
 from api.middleware import require_api_key
 from api.pipeline_config import create_pipeline_config
 from flask import Flask, Response, abort, jsonify, request
+from werkzeug.exceptions import HTTPException
 
 
 def log_request_info(request):
@@ -50,6 +52,24 @@ def log_request_info(request):
     logger.info("Request: %s", json.dumps(request_info, indent=None, sort_keys=True))
 
 
+def parse_model_parameter(data: dict, name: str, converter: type):
+    """Return a scalar override from the request body, aborting on bad input."""
+    value = data.get(name)
+    if value is None:
+        return None
+
+    # bool is an int subclass; reject it along with lists, dicts and strings
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        abort(400, description=f"Parameter '{name}' must be a number")
+
+    if converter is int:
+        if value != int(value):
+            abort(400, description=f"Parameter '{name}' must be an integer")
+        return int(value)
+
+    return float(value)
+
+
 def register_rag_chat_route(app: Flask):
     @app.route("/api/chat", methods=["POST"])
     @require_api_key
@@ -58,9 +78,12 @@ def register_rag_chat_route(app: Flask):
             if DEBUG:
                 log_request_info(request)
 
-            data = request.get_json()
+            try:
+                data = orjson.loads(request.get_data(cache=False))
+            except orjson.JSONDecodeError:
+                data = None
 
-            if not data:
+            if not data or not isinstance(data, dict):
                 logger.error("No JSON payload received.")
                 abort(400, description="Invalid JSON payload.")
 
@@ -71,6 +94,8 @@ def register_rag_chat_route(app: Flask):
             model = None
             if not IGNORE_MODEL_REQUEST:
                 model = data.get("model")
+                if model is not None and not isinstance(model, str):
+                    abort(400, description="Model must be a string")
                 if model and not ALLOW_MODEL_CHANGE:
                     abort(403, description="Model changes are not allowed")
 
@@ -94,7 +119,9 @@ def register_rag_chat_route(app: Flask):
             # tools = data.get("tools", [])
             # format_param = data.get("format")
             # keep_alive = data.get("keep_alive", "5m")
-            options = data.get("options", {})
+            options = data.get("options") or {}
+            if not isinstance(options, dict):
+                abort(400, description="Options must be an object")
             stream = data.get("stream", True)
 
             temperature = None
@@ -103,13 +130,15 @@ def register_rag_chat_route(app: Flask):
             seed = None
 
             if ALLOW_MODEL_PARAMETER_CHANGE:
-                temperature = data.get("temperature", None)
-                top_k = data.get("top_k", None)
-                top_p = data.get("top_p", None)
-                seed = data.get("seed", None)
+                temperature = parse_model_parameter(data, "temperature", float)
+                top_k = parse_model_parameter(data, "top_k", int)
+                top_p = parse_model_parameter(data, "top_p", float)
+                seed = parse_model_parameter(data, "seed", int)
 
             # Handle index parameter
             index = options.get("index")
+            if index is not None and not isinstance(index, str):
+                abort(400, description="Index must be a string")
             if index and not ALLOW_INDEX_CHANGE:
                 abort(403, description="Index changes are not allowed")
 
@@ -148,6 +177,8 @@ def register_rag_chat_route(app: Flask):
             else:
                 return handle_standard_response(config, query, conversation)
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error processing chat request: {str(e)}", exc_info=True)
             abort(500, description="Internal Server Error.")
@@ -26,10 +26,62 @@ class PipelineComponentFactory:
         self.document_store = document_store
         self.streaming_callback = streaming_callback
         self.logger = logging.getLogger(__name__)
+        self._generation_kwargs = (
+            self._build_generation_kwargs()
+            if config.provider == ModelProvider.OLLAMA
+            else None
+        )
+
+    def _build_generation_kwargs(self) -> dict:
+        """Collect the Ollama generation options set in the configuration."""
+        generation_kwargs = {}
+
+        # Core generation parameters
+        if self.config.temperature is not None:
+            generation_kwargs["temperature"] = self.config.temperature
+        if self.config.context_window is not None:
+            generation_kwargs["context_length"] = self.config.context_window
+        if self.config.seed is not None and self.config.seed > 0:
+            generation_kwargs["seed"] = self.config.seed
+        if self.config.top_k is not None:
+            generation_kwargs["top_k"] = self.config.top_k
+
+        # Advanced sampling parameters
+        if self.config.top_p is not None:
+            generation_kwargs["top_p"] = self.config.top_p
+        if self.config.min_p is not None:
+            generation_kwargs["min_p"] = self.config.min_p
+
+        # Mirostat parameters
+        if self.config.mirostat is not None:
+            generation_kwargs["mirostat"] = self.config.mirostat
+        if self.config.mirostat_eta is not None:
+            generation_kwargs["mirostat_eta"] = self.config.mirostat_eta
+        if self.config.mirostat_tau is not None:
+            generation_kwargs["mirostat_tau"] = self.config.mirostat_tau
+
+        # Repetition control
+        if self.config.repeat_last_n is not None:
+            generation_kwargs["repeat_last_n"] = self.config.repeat_last_n
+        if self.config.repeat_penalty is not None:
+            generation_kwargs["repeat_penalty"] = self.config.repeat_penalty
+
+        # Generation control
+        if self.config.num_predict is not None:
+            generation_kwargs["num_predict"] = self.config.num_predict
+        if self.config.tfs_z is not None:
+            generation_kwargs["tfs_z"] = self.config.tfs_z
+
+        # Optional stop sequence
+        if self.config.stop_sequence:
+            generation_kwargs["stop"] = self.config.stop_sequence
+
+        self.logger.info("Generation kwargs: %s", generation_kwargs)
+        return generation_kwargs
 
     def create_embedder(self):
         self.logger.info(
-            f"Initializing Text Embedder with model: {self.config.embedding_model}"
+            "Initializing Text Embedder with model: %s", self.config.embedding_model
         )
 
         if self.config.provider == ModelProvider.OLLAMA:
@@ -56,7 +108,9 @@ class PipelineComponentFactory:
     def create_retriever(self) -> ElasticsearchEmbeddingRetriever:
         """Create Elasticsearch retriever."""
         self.logger.info(
-            f"Initializing Elasticsearch Retriever with top_k={self.config.es_top_k} and num_candidates={self.config.es_num_candidates}"
+            "Initializing Elasticsearch Retriever with top_k=%s and num_candidates=%s",
+            self.config.es_top_k,
+            self.config.es_num_candidates,
         )
         retriever = ElasticsearchEmbeddingRetriever(
             document_store=self.document_store,
@@ -77,58 +131,16 @@ class PipelineComponentFactory:
 
     def create_chat_generator(self):
         """Create chat generator based on provider configuration."""
-        self.logger.info(f"Initializing Generator with model: {self.config.model_name}")
+        self.logger.info(
+            "Initializing Generator with model: %s", self.config.model_name
+        )
 
         if self.config.provider == ModelProvider.OLLAMA:
-            generation_kwargs = {}
-
-            # Core generation parameters
-            if self.config.temperature is not None:
-                generation_kwargs["temperature"] = self.config.temperature
-            if self.config.context_window is not None:
-                generation_kwargs["context_length"] = self.config.context_window
-            if self.config.seed is not None and self.config.seed > 0:
-                generation_kwargs["seed"] = self.config.seed
-            if self.config.top_k is not None:
-                generation_kwargs["top_k"] = self.config.top_k
-
-            # Advanced sampling parameters
-            if self.config.top_p is not None:
-                generation_kwargs["top_p"] = self.config.top_p
-            if self.config.min_p is not None:
-                generation_kwargs["min_p"] = self.config.min_p
-
-            # Mirostat parameters
-            if self.config.mirostat is not None:
-                generation_kwargs["mirostat"] = self.config.mirostat
-            if self.config.mirostat_eta is not None:
-                generation_kwargs["mirostat_eta"] = self.config.mirostat_eta
-            if self.config.mirostat_tau is not None:
-                generation_kwargs["mirostat_tau"] = self.config.mirostat_tau
-
-            # Repetition control
-            if self.config.repeat_last_n is not None:
-                generation_kwargs["repeat_last_n"] = self.config.repeat_last_n
-            if self.config.repeat_penalty is not None:
-                generation_kwargs["repeat_penalty"] = self.config.repeat_penalty
-
-            # Generation control
-            if self.config.num_predict is not None:
-                generation_kwargs["num_predict"] = self.config.num_predict
-            if self.config.tfs_z is not None:
-                generation_kwargs["tfs_z"] = self.config.tfs_z
-
-            # Optional stop sequence
-            if self.config.stop_sequence:
-                generation_kwargs["stop"] = self.config.stop_sequence
-
-            logging.info(f"Generation kwargs: {generation_kwargs}")
-
             # Instantiate generator
             generator = OllamaChatGenerator(
                 model=self.config.model_name,
                 url=self.config.ollama_url,
-                generation_kwargs=generation_kwargs,
+                generation_kwargs=self._generation_kwargs,
                 streaming_callback=self.streaming_callback,
                 timeout=240,
             )
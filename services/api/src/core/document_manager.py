@@ -1,10 +1,17 @@
 import logging
+import time
+from typing import Dict, Tuple
 
 import elasticsearch
 from haystack_integrations.document_stores.elasticsearch import (
     ElasticsearchDocumentStore,
 )
 
+DOC_COUNT_CACHE_TTL = 30.0
+
+# (es_url, es_index) -> (expires_at, doc_count)
+_doc_count_cache: Dict[Tuple[str, str], Tuple[float, int]] = {}
+
 
 class DocumentStoreManager:
     def __init__(
@@ -44,7 +51,7 @@ class DocumentStoreManager:
                 )
 
             self.document_store = ElasticsearchDocumentStore(**params)
-            doc_count = self.document_store.count_documents()
+            doc_count = self._count_documents_cached()
             self.logger.info(
                 f"Document store initialized successfully. Index '{self.es_index}' contains {doc_count} documents"
             )
@@ -61,3 +68,15 @@ class DocumentStoreManager:
                 f"Failed to initialize document store: {str(e)}", exc_info=True
             )
             raise
+
+    def _count_documents_cached(self) -> int:
+        """Return the index document count, refreshing it at most every TTL seconds."""
+        cache_key = (self.es_url, self.es_index)
+        now = time.monotonic()
+        cached = _doc_count_cache.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        doc_count = self.document_store.count_documents()
+        _doc_count_cache[cache_key] = (now + DOC_COUNT_CACHE_TTL, doc_count)
+        return doc_count
@@ -0,0 +1,31 @@
+import logging
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_ollama_session() -> requests.Session:
+    """Return the process-wide pooled HTTP session used for Ollama requests."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=8,
+                    pool_maxsize=32,
+                    max_retries=Retry(total=2, backoff_factor=0.2),
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                logger.info("Ollama HTTP keep-alive connection pool enabled")
+                _session = session
+    return _session
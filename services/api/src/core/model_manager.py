@@ -3,6 +3,7 @@ import logging
 from typing import Generator
 
 import requests
+from core.http_session import get_ollama_session
 from core.model_exceptions import ModelNotFoundError
 
 
@@ -11,13 +12,14 @@ class OllamaModelManager:
         self.logger = logging.getLogger(__name__)
         self.ollama_url = ollama_url
         self.allow_model_pull = allow_model_pull
+        self.http = get_ollama_session()
 
     def check_server_health(self):
         try:
             self.logger.info(
                 f"Checking connectivity to Ollama server at {self.ollama_url}"
             )
-            health_response = requests.get(self.ollama_url)
+            health_response = self.http.get(self.ollama_url)
 
             if health_response.status_code != 200:
                 raise Exception("Ollama server connectivity check failed.")
@@ -41,7 +43,7 @@ class OllamaModelManager:
             self.logger.info(f"Checking availability of model: {model_name}")
             yield {"type": "model_status", "status": "checking", "model": model_name}
 
-            show_response = requests.post(
+            show_response = self.http.post(
                 f"{self.ollama_url}/api/show", json={"model": model_name}
             )
 
@@ -89,7 +91,7 @@ class OllamaModelManager:
         last_percentage = -1
         pull_successful = False
 
-        with requests.post(
+        with self.http.post(
             f"{self.ollama_url}/api/pull", json={"model": model_name}, stream=True
         ) as response:
             if response.status_code != 200:
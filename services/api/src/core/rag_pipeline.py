@@ -1,5 +1,8 @@
 import logging
-from typing import Generator, List, Optional
+import threading
+from collections import OrderedDict
+from dataclasses import astuple
+from typing import Callable, Generator, List, Optional, Tuple
 
 import elasticsearch
 import pydantic
@@ -12,6 +15,50 @@ from haystack import Pipeline
 from haystack.components.builders import ChatPromptBuilder
 from haystack.dataclasses import ChatMessage
 
+PIPELINE_CACHE_SIZE = 16
+
+_pipeline_cache: "OrderedDict[Tuple, RAGQueryPipeline]" = OrderedDict()
+_pipeline_cache_lock = threading.Lock()
+
+
+class StreamingCallbackRouter:
+    """Forward streaming chunks to the callback registered by the running thread."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def set_callback(self, callback: Optional[Callable]) -> None:
+        self._local.callback = callback
+
+    def __call__(self, chunk) -> None:
+        callback = getattr(self._local, "callback", None)
+        if callback is not None:
+            callback(chunk)
+
+
+def get_rag_pipeline(
+    config: QueryPipelineConfig, streaming: bool = False
+) -> "RAGQueryPipeline":
+    """Return a cached pipeline for the configuration, creating it on first use."""
+    key = (streaming, astuple(config))
+    with _pipeline_cache_lock:
+        rag = _pipeline_cache.get(key)
+        if rag is not None:
+            _pipeline_cache.move_to_end(key)
+            return rag
+
+    rag = RAGQueryPipeline(
+        config=config,
+        streaming_callback=StreamingCallbackRouter() if streaming else None,
+    )
+
+    with _pipeline_cache_lock:
+        rag = _pipeline_cache.setdefault(key, rag)
+        _pipeline_cache.move_to_end(key)
+        while len(_pipeline_cache) > PIPELINE_CACHE_SIZE:
+            _pipeline_cache.popitem(last=False)
+    return rag
+
 
 class RAGQueryPipeline:
     template = [
@@ -70,6 +117,7 @@ class RAGQueryPipeline:
         self.config = config
         self._streaming_callback = streaming_callback
         self.query_pipeline = None
+        self._pipeline_lock = threading.Lock()
 
         # Initialize core components
         self._init_conversation_logger()
@@ -147,15 +195,34 @@ class RAGQueryPipeline:
             self.logger.error(f"Pipeline creation failed: {str(e)}", exc_info=True)
             raise
 
+    def _ensure_query_pipeline(self) -> Pipeline:
+        if not self.query_pipeline:
+            with self._pipeline_lock:
+                if not self.query_pipeline:
+                    self.create_query_pipeline()
+        return self.query_pipeline
+
+    def warm_up(self):
+        """Build the query pipeline and warm up its components before the first query."""
+        self._ensure_query_pipeline().warm_up()
+
     def run_query(
         self,
         query: str,
         conversation: List[dict] = None,
         print_response: bool = False,
+        streaming_callback: Optional[Callable] = None,
     ) -> Optional[dict]:
         """Execute a query through the RAG pipeline."""
-        if not self.query_pipeline:
-            self.create_query_pipeline()
+        self._ensure_query_pipeline()
+
+        router = (
+            self._streaming_callback
+            if isinstance(self._streaming_callback, StreamingCallbackRouter)
+            else None
+        )
+        if router:
+            router.set_callback(streaming_callback)
 
         try:
             # Prepare pipeline inputs
@@ -201,3 +268,6 @@ class RAGQueryPipeline:
         except Exception as e:
             self.logger.error(f"Query execution failed: {str(e)}")
             raise
+        finally:
+            if router:
+                router.set_callback(None)
@@ -1,7 +1,9 @@
 import os
 
 from api.config import APP_VERSION, BUILD_NUMBER, app, logger
+from api.pipeline_config import create_pipeline_config
 from api.routes_setup import setup_all_routes
+from core.rag_pipeline import get_rag_pipeline
 
 
 def show_welcome():
@@ -22,9 +24,23 @@ def show_welcome():
     print(f"{RESET}\n", flush=True)
 
 
+def prewarm_pipelines():
+    """Build pipelines listed in PIPELINE_PREWARM ("index:model,...") up front."""
+    for entry in filter(None, os.getenv("PIPELINE_PREWARM", "").split(",")):
+        index, _, model = entry.strip().partition(":")
+        try:
+            config = create_pipeline_config(model=model or None, index=index or None)
+            # Chat requests stream unless they opt out, so only that variant is built
+            get_rag_pipeline(config, streaming=True).warm_up()
+            logger.info(f"Pre-warmed pipeline for '{entry}'")
+        except Exception as e:
+            logger.warning(f"Failed to pre-warm pipeline for '{entry}': {e}")
+
+
 def create_app():
     try:
         setup_all_routes(app)
+        prewarm_pipelines()
         logger.info(f"Initialized Chipper API {APP_VERSION}.{BUILD_NUMBER}")
         return app
     except Exception as e:
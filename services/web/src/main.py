@@ -1,25 +1,29 @@
 import argparse
-import hashlib
 import logging
 import os
 import secrets
+import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from threading import Event
 from typing import Any, Dict, List
 
+import orjson
 import requests
 from dotenv import load_dotenv
 from flask import (
     Flask,
     Response,
+    g,
     jsonify,
     render_template,
     request,
     session,
     stream_with_context,
 )
+from flask.json.provider import DefaultJSONProvider
 from requests.exceptions import ConnectionError, RequestException, Timeout
 
 load_dotenv()
@@ -27,6 +31,8 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SESSION_LIFETIME_SECONDS = 24 * 60 * 60
+
 APP_VERSION = os.getenv("APP_VERSION", "[DEV]")
 BUILD_NUMBER = os.getenv("APP_BUILD_NUM", "0")
 
@@ -58,13 +64,16 @@ def get_api_health() -> Dict[str, Any]:
         headers = {"X-API-Key": os.getenv("API_KEY", "EXAMPLE_API_KEY")}
         response = requests.get(f"{api_url}/health", headers=headers, timeout=5)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         logger.error(f"API health check failed: {str(e)}")
         return {"status": "unhealthy", "error": "An internal error has occurred."}
 
 
 class SessionManager:
+    # Endpoints that never read or write session state
+    SESSIONLESS_ENDPOINTS = frozenset({"static", "get_asset_config", "health_check"})
+
     def __init__(self, app):
         self.app = app
         self.abort_flags = {}
@@ -74,12 +83,15 @@ class SessionManager:
             SESSION_COOKIE_SECURE=False,
             SESSION_COOKIE_HTTPONLY=True,
             SESSION_COOKIE_SAMESITE="Lax",
-            PERMANENT_SESSION_LIFETIME=timedelta(hours=24),
+            PERMANENT_SESSION_LIFETIME=timedelta(seconds=SESSION_LIFETIME_SECONDS),
         )
 
         @app.before_request
         def validate_session():
+            if request.endpoint in self.SESSIONLESS_ENDPOINTS:
+                return
             self._ensure_valid_session()
+            g.session_id8 = session["session_id"][:8]
 
     def get_abort_flag(self, session_id: str) -> Event:
         if session_id not in self.abort_flags:
@@ -94,7 +106,7 @@ class SessionManager:
     def reset_abort_flag(self, session_id: str):
         if session_id in self.abort_flags:
             self.abort_flags[session_id] = Event()
-            logger.debug(f"Reset abort flag for session {session_id[:8]}...")
+            logger.debug("Reset abort flag for session %s...", session_id[:8])
 
     def get_session(self):
         self._ensure_valid_session()
@@ -108,15 +120,19 @@ class SessionManager:
             logger.info("No session_id found - initializing new session")
             self._initialize_new_session()
         elif "created_at" in session:
-            created_at = datetime.fromisoformat(session["created_at"])
-            if datetime.now() - created_at > timedelta(hours=24):
+            created_at = session["created_at"]
+            if isinstance(created_at, str):
+                # Migrate sessions created before timestamps were stored as epochs
+                created_at = int(datetime.fromisoformat(created_at).timestamp())
+                session["created_at"] = created_at
+            if time.time() - created_at > SESSION_LIFETIME_SECONDS:
                 logger.warning(
-                    f"Session expired (created: {created_at.isoformat()}) - initializing new session"
+                    f"Session expired (created: {created_at}) - initializing new session"
                 )
                 self._initialize_new_session()
             else:
                 logger.debug(
-                    f"Valid session found (id: {session['session_id'][:8]}...)"
+                    "Valid session found (id: %s...)", session["session_id"][:8]
                 )
 
     def _initialize_new_session(self):
@@ -124,10 +140,11 @@ class SessionManager:
         session.clear()
         new_session_id = secrets.token_urlsafe(32)
         session["session_id"] = new_session_id
-        session["created_at"] = datetime.now().isoformat()
+        session["created_at"] = int(time.time())
         session["messages"] = []
+        g.session_id8 = new_session_id[:8]
         logger.info(
-            f"New session initialized: {old_session_id[:8]}... → {new_session_id[:8]}..."
+            f"New session initialized: {old_session_id[:8]}... → {g.session_id8}..."
         )
 
     def get_chat_messages(self) -> List[Dict]:
@@ -135,13 +152,11 @@ class SessionManager:
         return session.get("messages", [])
 
     def update_chat_messages(self, role: str, content: str, max_size: int):
-        messages = self.get_chat_messages()
+        messages = deque(self.get_chat_messages(), maxlen=max_size)
         messages.append(
             {"role": role, "content": content, "timestamp": datetime.now().isoformat()}
         )
-        if len(messages) > max_size:
-            messages = messages[-max_size:]
-        session["messages"] = messages
+        session["messages"] = list(messages)
 
     def clear_messages(self):
         if "session_id" in session:
@@ -157,10 +172,16 @@ class AssetConfig:
         self.asset_url = os.getenv("ASSET_URL", "/static")
         self.cache_timeout = int(os.getenv("ASSET_CACHE_TIMEOUT", "31536000"))
         self.debug_assets = os.getenv("ASSET_DEBUG", "False").lower() == "true"
-        self.asset_version = os.getenv("ASSET_VERSION", self._generate_version())
+        self.asset_version = os.getenv("ASSET_VERSION") or self._generate_version()
 
     def _generate_version(self) -> str:
-        return hashlib.md5(str(datetime.now().timestamp()).encode()).hexdigest()[:8]
+        # Assets only change between builds, so the build identifier is enough
+        if git_sha := os.getenv("GIT_SHA"):
+            return git_sha[:8]
+        if BUILD_NUMBER != "0":
+            return BUILD_NUMBER[:8]
+        # Local builds have no build id; bust caches on every restart instead
+        return str(int(time.time()))
 
     def get_asset_url(self, filename: str) -> str:
         if self.debug_assets:
@@ -169,6 +190,18 @@ class AssetConfig:
         return f"{self.asset_url}/{filename}?v={self.asset_version}"
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    sort_keys = False
+    compact = True
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
 class MessageType(Enum):
     USER = "user"
     ASSISTANT = "assistant"
@@ -194,7 +227,7 @@ def make_api_request(endpoint: str, data: Dict, stream: bool = False) -> Any:
         response = requests.post(
             f"{api_url}{endpoint}",
             headers=headers,
-            json=data,
+            data=orjson.dumps(data),
             stream=stream,
             timeout=120,
         )
@@ -215,6 +248,7 @@ def create_app():
         static_folder="static",
         template_folder="templates",
     )
+    app.json = OrjsonProvider(app)
     session_manager = SessionManager(app)
     app.config["session_manager"] = session_manager
     asset_config = AssetConfig()
@@ -230,7 +264,10 @@ def create_app():
     @app.route("/api/chat", methods=["POST"])
     def chat():
         try:
-            data = request.get_json()
+            try:
+                data = orjson.loads(request.get_data(cache=False))
+            except orjson.JSONDecodeError:
+                data = None
             if not data:
                 return (
                     jsonify(
@@ -244,6 +281,7 @@ def create_app():
                 )
 
             session_id = session.get("session_id")
+            session_id8 = g.session_id8
             abort_flag = session_manager.get_abort_flag(session_id)
             session_manager.reset_abort_flag(session_id)
 
@@ -256,7 +294,7 @@ def create_app():
                         for chunk in api_response.iter_lines():
                             if abort_flag.is_set():
                                 logger.info(
-                                    f"Aborting stream for session {session_id[:8]}..."
+                                    f"Aborting stream for session {session_id8}..."
                                 )
                                 api_response.close()
                                 yield 'data: {"type": "abort", "content": "Request aborted"}\n\n'
@@ -282,7 +320,9 @@ def create_app():
                 # non-streaming response
                 logger.info("Processing non-streaming request")
                 response = make_api_request("/api/chat", data)
-                return response.json()
+                # Relay the API's JSON body as-is instead of decoding and
+                # re-encoding it.
+                return Response(response.content, mimetype="application/json")
 
         except (ConnectionError, Timeout):
             return (
@@ -1,24 +1,49 @@
 import argparse
 import asyncio
-import json
 import logging
 import os
+import random
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, AsyncGenerator, Deque, Dict, List, Optional
+from itertools import islice
+from typing import Any, AsyncGenerator, Deque, Dict, Optional, Sequence
 from urllib.parse import urljoin
 
 import aiohttp
+import orjson
 from rich.console import Console
 from rich.logging import RichHandler
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import IntPrompt, Prompt
+from rich.text import Text
 from rich.theme import Theme
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 APP_VERSION = os.getenv("APP_VERSION", "[DEV]")
 BUILD_NUMBER = os.getenv("APP_BUILD_NUM", "0")
+MESSAGE_HISTORY_SIZE = 1000
+
+WELCOME_TEXT = """
+    Available commands:
+    * /help     - Show this help message
+    * /quit     - Exit the application
+    * /clear    - Clear the screen
+    * /history  - Show message history
+    * /context  - Adjust context size
+    * /model    - Set the model name
+    * /index    - Set the index name
+    * /settings - Show current settings
+    * /retry    - Retry last query
+    * /stream   - Toggle streaming mode
+
+    Type your message and press Enter to chat.
+    """
 
 
 class MessageType(Enum):
@@ -33,12 +58,20 @@ class Message:
     content: str
     type: MessageType
     timestamp: float = None
+    _rendered: Optional[Panel] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 class APIError(Exception):
     pass
 
 
+def clean_text(text: str) -> str:
+    """Drop characters that cannot be encoded as UTF-8, e.g. lone surrogates."""
+    return text.encode("utf-8", errors="ignore").decode("utf-8")
+
+
 class Config:
     def __init__(
         self,
@@ -76,11 +109,18 @@ class AsyncAPIClient:
         self.logger = logging.getLogger(__name__)
         self.max_retries = self.config.max_retries
         self.retry_delay = self.config.retry_delay
+        self._options: Dict[str, str] = {}
+        self._options_key: Optional[tuple] = None
 
     async def __aenter__(self):
+        # The CLI only ever talks to one host, so size the pool for it and
+        # keep connections alive across prompts.
         connector = aiohttp.TCPConnector(
-            limit=10,
-            keepalive_timeout=30,
+            limit=4,
+            limit_per_host=4,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            keepalive_timeout=120,
             enable_cleanup_closed=True,
             force_close=False,
         )
@@ -89,10 +129,12 @@ class AsyncAPIClient:
                 "X-API-Key": self.config.api_key,
                 "Content-Type": "application/json",
             },
+            # No total deadline: long LLM replies are bounded by read inactivity
+            # instead of being aborted mid-response.
             timeout=aiohttp.ClientTimeout(
-                total=self.config.timeout,
+                total=None,
                 connect=30.0,
-                sock_read=90.0,
+                sock_read=self.config.timeout,
                 sock_connect=30.0,
             ),
             connector=connector,
@@ -104,41 +146,57 @@ class AsyncAPIClient:
             await self.session.close()
 
     async def _make_request(
-        self, method: str, endpoint: str, attempt: int = 1, **kwargs
+        self, method: str, endpoint: str, **kwargs
     ) -> Dict[str, Any]:
         url = urljoin(self.config.base_url, endpoint)
         kwargs.setdefault("ssl", self.config.verify_ssl)
-
-        try:
-            async with self.session.request(method, url, **kwargs) as response:
-                response.raise_for_status()
-                if method.upper() == "HEAD":
-                    return {}
-                return await response.json()
-
-        except asyncio.TimeoutError:
-            self.logger.warning(
-                f"Request timed out (attempt {attempt}/{self.max_retries})"
+        if "json" in kwargs:
+            # Encode once up front and hand aiohttp a ready payload it writes as-is
+            kwargs["data"] = aiohttp.BytesPayload(
+                orjson.dumps(kwargs.pop("json")), content_type="application/json"
             )
-            if attempt < self.max_retries:
-                await asyncio.sleep(self.retry_delay * attempt)
-                return await self._make_request(method, endpoint, attempt + 1, **kwargs)
-            raise APIError("Request timed out after all retries")
-
-        except aiohttp.ClientResponseError as e:
-            if e.status == 429 and attempt < self.max_retries:
-                retry_after = int(e.headers.get("Retry-After", self.retry_delay * 2))
-                await asyncio.sleep(retry_after)
-                return await self._make_request(method, endpoint, attempt + 1, **kwargs)
-            raise APIError(f"API request failed: {str(e)}")
-
-        except aiohttp.ClientError as e:
-            if attempt < self.max_retries and isinstance(
-                e, (aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError)
-            ):
-                await asyncio.sleep(self.retry_delay * attempt)
-                return await self._make_request(method, endpoint, attempt + 1, **kwargs)
-            raise APIError(f"API request failed: {str(e)}")
+
+        for attempt in range(1, self.max_retries + 1):
+            is_last_attempt = attempt == self.max_retries
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    response.raise_for_status()
+                    if method.upper() == "HEAD":
+                        return {}
+                    raw = await response.read()
+                    return orjson.loads(raw) if raw else {}
+
+            except orjson.JSONDecodeError as e:
+                raise APIError(f"Invalid JSON response: {str(e)}")
+
+            except asyncio.TimeoutError:
+                self.logger.warning(
+                    f"Request timed out (attempt {attempt}/{self.max_retries})"
+                )
+                if is_last_attempt:
+                    raise APIError("Request timed out after all retries")
+                await asyncio.sleep(self._backoff(attempt))
+
+            except aiohttp.ClientResponseError as e:
+                if e.status != 429 or is_last_attempt:
+                    raise APIError(f"API request failed: {str(e)}")
+                retry_after = e.headers.get("Retry-After") if e.headers else None
+                await asyncio.sleep(
+                    int(retry_after) if retry_after else self._backoff(attempt)
+                )
+
+            except aiohttp.ClientError as e:
+                if is_last_attempt or not isinstance(
+                    e, (aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError)
+                ):
+                    raise APIError(f"API request failed: {str(e)}")
+                await asyncio.sleep(self._backoff(attempt))
+
+        raise APIError("API request failed: no attempts made")
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given 1-based attempt."""
+        return self.retry_delay * 2 ** (attempt - 1) + random.uniform(0, 0.1)
 
     async def _stream_response(
         self, response: aiohttp.ClientResponse
@@ -152,7 +210,7 @@ class AsyncAPIClient:
                 while "\n\n" in buffer:
                     message, buffer = buffer.split("\n\n", 1)
                     if message.startswith("data: "):
-                        data = json.loads(message[6:])
+                        data = orjson.loads(message[6:])
 
                         if "chunk" in data:
                             yield data["chunk"]
@@ -164,27 +222,31 @@ class AsyncAPIClient:
                         if data.get("done", False):
                             return
 
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        except (orjson.JSONDecodeError, UnicodeDecodeError) as e:
             raise APIError(f"Failed to decode stream: {str(e)}")
 
+    def _get_options(self) -> Dict[str, str]:
+        """Return request options, rebuilt only after /model or /index changes."""
+        key = (self.config.model, self.config.index)
+        if key != self._options_key:
+            self._options = {
+                name: value
+                for name, value in zip(("model", "index"), key)
+                if value is not None
+            }
+            self._options_key = key
+        return self._options
+
     async def query(
-        self, query_text: str, conversation_context: List[Dict[str, str]]
+        self, query_text: str, conversation_context: Sequence[Dict[str, str]]
     ) -> Dict[str, Any]:
-        messages = []
-        for ctx in conversation_context:
-            clean_content = (
-                ctx["content"].encode("utf-8", errors="ignore").decode("utf-8")
-            )
-            messages.append({"role": ctx["role"], "content": clean_content})
+        # Context entries are already cleaned when added to the conversation.
+        messages = [
+            *conversation_context,
+            {"role": "user", "content": clean_text(query_text)},
+        ]
 
-        clean_query = query_text.encode("utf-8", errors="ignore").decode("utf-8")
-        messages.append({"role": "user", "content": clean_query})
-
-        options = {
-            k: v
-            for k, v in {"model": self.config.model, "index": self.config.index}.items()
-            if v is not None
-        }
+        options = self._get_options()
 
         try:
             response = await self._make_request(
@@ -230,7 +292,7 @@ class ChatInterface:
         self.conversation_context: Deque[Dict[str, str]] = deque(
             maxlen=self.config.max_context_size
         )
-        self.message_history: List[Message] = []
+        self.message_history: Deque[Message] = deque(maxlen=MESSAGE_HISTORY_SIZE)
         self.commands = {
             "/quit": self._cmd_quit,
             "/clear": self._cmd_clear,
@@ -245,10 +307,15 @@ class ChatInterface:
         }
         self.last_query = None
         self.last_context = None
+        self._welcome_panel = Panel(
+            Markdown(WELCOME_TEXT),
+            title=f"Chat CLI {APP_VERSION}.{BUILD_NUMBER}",
+            border_style="blue",
+        )
 
-    async def _handle_query(self, user_input: str, context: list = None):
+    async def _handle_query(self, user_input: str, context: Sequence = None):
         if context is None:
-            context = list(self.conversation_context)
+            context = tuple(self.conversation_context)
 
         try:
             if self.config.streaming:
@@ -262,7 +329,7 @@ class ChatInterface:
                 Message(f"Error: {str(e)}\nUse /retry to try again.", MessageType.ERROR)
             )
 
-    async def _handle_non_streaming_query(self, user_input: str, context: list):
+    async def _handle_non_streaming_query(self, user_input: str, context: Sequence):
         try:
             with self.console.status("[bold blue]Thinking...", spinner="dots"):
                 response = await self.client.query(user_input, context)
@@ -290,28 +357,7 @@ class ChatInterface:
             raise e
 
     def display_welcome(self):
-        welcome_text = """
-    Available commands:
-    * /help     - Show this help message
-    * /quit     - Exit the application
-    * /clear    - Clear the screen
-    * /history  - Show message history
-    * /context  - Adjust context size
-    * /model    - Set the model name
-    * /index    - Set the index name
-    * /settings - Show current settings
-    * /retry    - Retry last query
-    * /stream   - Toggle streaming mode
-
-    Type your message and press Enter to chat.
-    """
-        self.console.print(
-            Panel(
-                Markdown(welcome_text),
-                title=f"Chat CLI {APP_VERSION}.{BUILD_NUMBER}",
-                border_style="blue",
-            )
-        )
+        self.console.print(self._welcome_panel)
 
     def get_user_input(self) -> str:
         """Get input from the user with proper formatting."""
@@ -323,18 +369,30 @@ class ChatInterface:
             )
             return ""
 
+    @staticmethod
+    def _render(message: Message) -> Panel:
+        """Build the message panel once; Markdown parsing is the costly part."""
+        if message._rendered is None:
+            # Only assistant replies carry Markdown; render the rest as plain text
+            content = (
+                Markdown(message.content)
+                if message.type == MessageType.ASSISTANT
+                else Text(message.content)
+            )
+            message._rendered = Panel(
+                content,
+                border_style=message.type.value,
+                title=message.type.value.title(),
+                title_align="left",
+            )
+        return message._rendered
+
     def display_message(self, message: Message):
-        panel = Panel(
-            Markdown(message.content),
-            border_style=message.type.value,
-            title=message.type.value.title(),
-            title_align="left",
-        )
-        self.console.print(panel)
+        self.console.print(self._render(message))
         self.message_history.append(message)
         if message.type in [MessageType.USER, MessageType.ASSISTANT]:
             self.conversation_context.append(
-                {"role": message.type.value, "content": message.content}
+                {"role": message.type.value, "content": clean_text(message.content)}
             )
 
     async def run(self):
@@ -361,7 +419,7 @@ class ChatInterface:
                         self.display_message(user_message)
 
                         self.last_query = user_input
-                        self.last_context = list(self.conversation_context)
+                        self.last_context = tuple(self.conversation_context)
 
                         await self._handle_query(user_input)
 
@@ -390,8 +448,9 @@ class ChatInterface:
         if not self.message_history:
             self.console.print("[blue]No message history available.[/blue]")
             return True
-        for msg in self.message_history[-10:]:
-            self.console.print(f"[{msg.type.value}]{msg.content}[/{msg.type.value}]")
+        start = max(0, len(self.message_history) - 10)
+        for msg in islice(self.message_history, start, None):
+            self.console.print(self._render(msg))
         return True
 
     async def _cmd_help(self) -> bool:
@@ -402,9 +461,7 @@ class ChatInterface:
         new_size = IntPrompt.ask(
             "[blue]Enter new context size[/blue]", default=self.config.max_context_size
         )
-        self.conversation_context = deque(
-            list(self.conversation_context), maxlen=new_size
-        )
+        self.conversation_context = deque(self.conversation_context, maxlen=new_size)
         self.config.max_context_size = new_size
         self.console.print(f"[blue]Context size updated to {new_size}[/blue]")
         return True
@@ -465,7 +522,11 @@ class ChatInterface:
         return True
 
     async def process_command(self, command: str) -> bool:
-        cmd_func = self.commands.get(command.lower())
+        # Dispatch on the first token; command names are already lowercase
+        head = command.split(None, 1)[0]
+        if not head.islower():
+            head = head.lower()
+        cmd_func = self.commands.get(head)
         if cmd_func:
             return await cmd_func()
         self.console.print(f"[blue]Unknown command: {command}[/blue]")
@@ -481,45 +542,44 @@ def setup_logging(log_level):
 
 
 def main():
+    env = os.environ.copy()
     parser = argparse.ArgumentParser(
         description=f"Chat CLI {APP_VERSION}.{BUILD_NUMBER}"
     )
     parser.add_argument(
-        "--host", default=os.getenv("API_HOST", "0.0.0.0"), help="API Host"
-    )
-    parser.add_argument(
-        "--port", default=os.getenv("API_PORT", "8000"), help="API Port"
+        "--host", default=env.get("API_HOST", "0.0.0.0"), help="API Host"
     )
-    parser.add_argument("--api_key", default=os.getenv("API_KEY"), help="API Key")
+    parser.add_argument("--port", default=env.get("API_PORT", "8000"), help="API Port")
+    parser.add_argument("--api_key", default=env.get("API_KEY"), help="API Key")
     parser.add_argument(
         "--timeout",
         type=int,
-        default=int(os.getenv("API_TIMEOUT", "120")),
+        default=env.get("API_TIMEOUT", "120"),
         help="API Timeout",
     )
     parser.add_argument(
         "--verify_ssl",
         action="store_true",
-        default=os.getenv("REQUIRE_SECURE", "False").lower() == "true",
+        default=env.get("REQUIRE_SECURE", "False").lower() == "true",
         help="Verify SSL",
     )
     parser.add_argument(
-        "--log_level", default=os.getenv("LOG_LEVEL", "INFO"), help="Log Level"
+        "--log_level", default=env.get("LOG_LEVEL", "INFO"), help="Log Level"
     )
     parser.add_argument(
         "--max_context_size",
         type=int,
-        default=int(os.getenv("MAX_CONTEXT_SIZE", "10")),
+        default=env.get("MAX_CONTEXT_SIZE", "10"),
         help="Maximum Context Size",
     )
     parser.add_argument(
         "--model",
-        default=os.getenv("MODEL_NAME"),
+        default=env.get("MODEL_NAME"),
         help="Model name to use",
     )
     parser.add_argument(
         "--index",
-        default=os.getenv("ES_INDEX"),
+        default=env.get("ES_INDEX"),
         help="Index to use",
     )
 
@@ -542,7 +602,10 @@ def main():
 
     setup_logging(config.log_level)
     chat = ChatInterface(config)
-    asyncio.run(chat.run())
+    if uvloop is not None:
+        uvloop.run(chat.run())
+    else:
+        asyncio.run(chat.run())
 
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
 import asyncio
-import json
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import aiohttp
+import orjson
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 
 @dataclass
@@ -37,10 +42,14 @@ class ApiMirrorTester:
         Chipper_api_base: str,
         ollama_api_base: str = "http://localhost:11434",
         verify_ssl: bool = True,
+        max_concurrency: int = 4,
     ):
         self.Chipper_api_base = Chipper_api_base.rstrip("/")
         self.ollama_api_base = ollama_api_base.rstrip("/")
         self.verify_ssl = verify_ssl
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Bounds in-flight probes so the backends are not overloaded
+        self._semaphore = asyncio.Semaphore(max_concurrency)
 
         self.endpoints = [
             EndpointConfig(
@@ -69,67 +78,98 @@ class ApiMirrorTester:
             ),
         ]
 
+        # (base_url, path) -> (url, headers, encoded payload), built once per probe
+        self._requests: Dict[Tuple[str, str], Tuple[str, Dict, Optional[bytes]]] = {
+            (base_url, endpoint.path): (
+                f"{base_url}{endpoint.path}",
+                (
+                    {"Content-Type": "application/json"}
+                    if endpoint.sample_payload
+                    else {}
+                ),
+                (
+                    orjson.dumps(endpoint.sample_payload)
+                    if endpoint.sample_payload
+                    else None
+                ),
+            )
+            for base_url in (self.Chipper_api_base, self.ollama_api_base)
+            for endpoint in self.endpoints
+        }
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            ssl=self.verify_ssl,
+            limit=100,
+            limit_per_host=32,
+            keepalive_timeout=75,
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
     async def test_endpoint(
         self, base_url: str, endpoint: EndpointConfig
     ) -> ApiResponse:
         """Test a single endpoint and return its response."""
-        print(f"\nTesting {base_url}{endpoint.path}...")
-        url = f"{base_url}{endpoint.path}"
-        headers = (
-            {"Content-Type": "application/json"} if endpoint.sample_payload else {}
-        )
+        async with self._semaphore:
+            return await self._request_endpoint(base_url, endpoint)
 
-        connector = aiohttp.TCPConnector(verify_ssl=self.verify_ssl)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.request(
-                method=endpoint.method,
-                url=url,
-                json=endpoint.sample_payload,
-                headers=headers,
-            ) as response:
-                if endpoint.path == "/api/chat" and endpoint.sample_payload.get(
-                    "stream", False
-                ):
-                    print(f"Reading streaming response from {base_url}...")
-                    chunks = []
-                    chunk_count = 0
-                    async for line in response.content:
-                        if line:
-                            chunk = line.decode().strip()
-                            if chunk:
-                                try:
-                                    parsed_chunk = json.loads(chunk)
-                                    chunks.append(parsed_chunk)
-                                    chunk_count += 1
-                                    if chunk_count % 5 == 0:
-                                        print(
-                                            f"Received {chunk_count} chunks from {base_url}..."
-                                        )
-                                except json.JSONDecodeError:
-                                    print(
-                                        f"Warning: Skipping invalid JSON chunk from {base_url}: {chunk[:100]}..."
-                                    )
-
-                    body = chunks[-1] if chunks else {}
+    async def _request_endpoint(
+        self, base_url: str, endpoint: EndpointConfig
+    ) -> ApiResponse:
+        url, headers, data = self._requests[(base_url, endpoint.path)]
+        print(f"\nTesting {url}...")
+
+        async with self._session.request(
+            method=endpoint.method,
+            url=url,
+            data=data,
+            headers=headers,
+        ) as response:
+            if endpoint.path == "/api/chat" and endpoint.sample_payload.get(
+                "stream", False
+            ):
+                print(f"Reading streaming response from {base_url}...")
+                buffer = bytearray()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    buffer += chunk
+
+                # Only the final NDJSON object is compared, so skip parsing the rest
+                lines = [line for line in buffer.split(b"\n") if line.strip()]
+                chunk_count = len(lines)
+                try:
+                    body = orjson.loads(lines[-1]) if lines else {}
+                except orjson.JSONDecodeError:
+                    preview = lines[-1][:100].decode("utf-8", errors="replace")
                     print(
-                        f"Completed streaming for {base_url}. Received {chunk_count} total chunks."
+                        f"Warning: Skipping invalid JSON chunk from {base_url}: {preview}..."
                     )
-                else:
-                    body = await response.json()
+                    body = {}
 
-                return ApiResponse(
-                    status=response.status, headers=dict(response.headers), body=body
+                print(
+                    f"Completed streaming for {base_url}. Received {chunk_count} total chunks."
                 )
+            else:
+                body = await response.json(loads=orjson.loads)
+
+            # Only the content type is compared, so skip copying every header
+            return ApiResponse(
+                status=response.status,
+                headers={"content-type": response.headers.get("content-type", "")},
+                body=body,
+            )
 
     def compare_responses(
         self, Chipper_response: ApiResponse, ollama_response: ApiResponse
     ) -> tuple[float, List[str]]:
-        match_score = 0
         differences = []
 
-        if Chipper_response.status == ollama_response.status:
-            match_score += 0.25
-        else:
+        status_eq = Chipper_response.status == ollama_response.status
+        if not status_eq:
             differences.append(
                 f"Status code mismatch: {Chipper_response.status} vs {ollama_response.status}"
             )
@@ -137,26 +177,31 @@ class ApiMirrorTester:
         Chipper_content_type = Chipper_response.headers.get("content-type", "")
         ollama_content_type = ollama_response.headers.get("content-type", "")
 
-        if Chipper_content_type == ollama_content_type:
-            match_score += 0.25
-        else:
+        content_type_eq = Chipper_content_type == ollama_content_type
+        if not content_type_eq:
             differences.append(
                 f"Content-Type header mismatch: {Chipper_content_type} vs {ollama_content_type}"
             )
 
-        Chipper_keys = set(Chipper_response.body.keys())
-        ollama_keys = set(ollama_response.body.keys())
+        # Dict key views are set-like, so no intermediate sets are needed
+        Chipper_keys = Chipper_response.body.keys()
+        ollama_keys = ollama_response.body.keys()
 
-        common_keys = Chipper_keys & ollama_keys
-        structure_score = len(common_keys) / max(len(Chipper_keys), len(ollama_keys))
-        match_score += structure_score * 0.5
+        n_common = len(Chipper_keys & ollama_keys)
+        n_keys = max(len(Chipper_keys), len(ollama_keys))
 
-        missing_keys = ollama_keys - Chipper_keys
-        extra_keys = Chipper_keys - ollama_keys
+        # Two empty bodies count as a full structural match
+        match_score = (
+            0.25 * status_eq
+            + 0.25 * content_type_eq
+            + 0.5 * (n_common / n_keys if n_keys else 1.0)
+        )
 
-        if missing_keys:
+        if len(ollama_keys) > n_common:
+            missing_keys = ollama_keys - Chipper_keys
             differences.append(f"Missing fields: {', '.join(missing_keys)}")
-        if extra_keys:
+        if len(Chipper_keys) > n_common:
+            extra_keys = Chipper_keys - ollama_keys
             differences.append(f"Extra fields: {', '.join(extra_keys)}")
 
         return round(match_score, 2), differences
@@ -165,49 +210,54 @@ class ApiMirrorTester:
         """Compare Chipper API against the Ollama API for all endpoints."""
         print("\nStarting API comparison...")
         total_endpoints = len(self.endpoints)
-        results = []
-
-        for idx, endpoint in enumerate(self.endpoints, 1):
-            print(
-                f"\nTesting endpoint {idx}/{total_endpoints}: {endpoint.method} {endpoint.path}"
-            )
-            try:
-                print("\nTesting Chipper API endpoint...")
-                Chipper_response = await self.test_endpoint(
-                    self.Chipper_api_base, endpoint
-                )
 
-                print("\nTesting Ollama API endpoint...")
-                ollama_response = await self.test_endpoint(
-                    self.ollama_api_base, endpoint
+        return list(
+            await asyncio.gather(
+                *(
+                    self._compare_endpoint(idx, total_endpoints, endpoint)
+                    for idx, endpoint in enumerate(self.endpoints, 1)
                 )
+            )
+        )
 
-                match_score, differences = self.compare_responses(
-                    Chipper_response, ollama_response
-                )
+    async def _compare_endpoint(
+        self, idx: int, total_endpoints: int, endpoint: EndpointConfig
+    ) -> ComparisonResult:
+        """Probe both APIs for one endpoint concurrently and compare them."""
+        print(
+            f"\nTesting endpoint {idx}/{total_endpoints}: {endpoint.method} {endpoint.path}"
+        )
+        try:
+            responses = await asyncio.gather(
+                self.test_endpoint(self.Chipper_api_base, endpoint),
+                self.test_endpoint(self.ollama_api_base, endpoint),
+                return_exceptions=True,
+            )
+            for response in responses:
+                if isinstance(response, Exception):
+                    raise response
+            Chipper_response, ollama_response = responses
 
-                results.append(
-                    ComparisonResult(
-                        endpoint=endpoint.path,
-                        method=endpoint.method,
-                        match_score=match_score,
-                        differences=differences,
-                        Chipper_response=Chipper_response,
-                        ollama_response=ollama_response,
-                    )
-                )
-            except Exception as e:
-                results.append(
-                    ComparisonResult(
-                        endpoint=endpoint.path,
-                        method=endpoint.method,
-                        match_score=0.0,
-                        differences=[],
-                        error=str(e),
-                    )
-                )
+            match_score, differences = self.compare_responses(
+                Chipper_response, ollama_response
+            )
 
-        return results
+            return ComparisonResult(
+                endpoint=endpoint.path,
+                method=endpoint.method,
+                match_score=match_score,
+                differences=differences,
+                Chipper_response=Chipper_response,
+                ollama_response=ollama_response,
+            )
+        except Exception as e:
+            return ComparisonResult(
+                endpoint=endpoint.path,
+                method=endpoint.method,
+                match_score=0.0,
+                differences=[],
+                error=str(e),
+            )
 
     def print_results(self, results: List[ComparisonResult]):
         """Print the comparison results in a readable format."""
@@ -233,15 +283,17 @@ class ApiMirrorTester:
 
 
 async def main():
-    tester = ApiMirrorTester(
+    async with ApiMirrorTester(
         Chipper_api_base="http://localhost:21434/",
         ollama_api_base="http://localhost:11434",
         verify_ssl=False,
-    )
-
-    results = await tester.compare_apis()
-    tester.print_results(results)
+    ) as tester:
+        results = await tester.compare_apis()
+        tester.print_results(results)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
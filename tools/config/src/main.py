@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import fnmatch
 import logging
 import os
 import re
@@ -22,6 +23,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger("env_manager")
 
+# Classifies each line of an env file: blank, comment (commented-out
+# assignments are consumed without a comment group), assignment, or other.
+# Matches raw bytes so only the captured groups need decoding; a trailing
+# "\r" from CRLF files is absorbed by the whitespace before "$".
+ENV_LINE_RE = re.compile(
+    rb"""
+    ^[^\S\n]*
+    (?:
+        (?P<blank>$)
+      | \#[^\S\n]*(?:[A-Za-z_][A-Za-z0-9_]*=.*|(?P<comment>.*?)[^\S\n]*)$
+      | (?P<key>[A-Za-z_][A-Za-z0-9_]*)=(?P<value>.*?)[^\S\n]*$
+      | .*
+    )
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+BOOL_VALUES = frozenset(("true", "false"))
+INT_RE = re.compile(r"[+-]?\d+")
+FLOAT_RE = re.compile(r"[+-]?(?:\d+\.\d*|\.\d+|\d+(?=[eE]))(?:[eE][+-]?\d+)?")
+
+
+def compile_globs(patterns: List[str]) -> re.Pattern:
+    """Combine shell-style file name patterns into a single regex."""
+    if not patterns:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def compile_blocklist(paths: List[str]) -> Optional[re.Pattern]:
+    """Match any blocklisted path that appears as whole segments of a path."""
+    patterns = [re.escape(path.replace("\\", "/")) for path in paths if path]
+    if not patterns:
+        return None
+    return re.compile(f"(?:^|/)(?:{'|'.join(patterns)})(?:/|$)")
+
 
 @dataclass
 class EnvVariable:
@@ -37,6 +74,8 @@ class EnvFile:
     service: str
     index: int
     relative_depth: int
+    relative_path: Path
+    service_label: str
 
 
 @dataclass
@@ -55,6 +94,10 @@ class EnvManager:
         self.config = config or EnvManagerConfig()
         if self.config.debug:
             logger.setLevel(logging.DEBUG)
+        self._blocklist_re = compile_blocklist(self.config.blocklist_paths)
+        # start_path never changes, so derive its string form and depth once
+        self._start_path_str = str(self.config.start_path)
+        self._start_depth = len(self.config.start_path.parts)
 
         self.styles = {
             "header": Style(color="bright_white", bold=True),
@@ -68,37 +111,33 @@ class EnvManager:
             "even_row": Style(bgcolor="grey7"),
             "odd_row": Style(),
         }
+        # (mtime_ns of every walked directory, env files found)
+        self._env_files_cache: Optional[Tuple[Dict[str, int], List[Path]]] = None
+        # (file path and variable snapshot, panel rendered for it)
+        self._vars_panel_cache: Optional[Tuple[tuple, Panel]] = None
 
     def parse_type(self, value: str) -> Tuple[str, str]:
-        if value.lower() in ("true", "false"):
-            return "bool", value.lower()
-        try:
-            float(value)
-            return ("float", value) if "." in value else ("int", value)
-        except ValueError:
-            return "string", value
+        lowered = value.lower()
+        if lowered in BOOL_VALUES:
+            return "bool", lowered
+        if INT_RE.fullmatch(value):
+            return "int", value
+        if FLOAT_RE.fullmatch(value):
+            return "float", value
+        return "string", value
 
     def parse_env_file(self, file_path: Path) -> Dict[str, EnvVariable]:
         env_vars: Dict[str, EnvVariable] = {}
         pending_comments: List[str] = []
 
-        for line in file_path.read_text().splitlines():
-            line = line.strip()
-            if not line:
-                pending_comments = []
-                continue
-
-            if line.startswith("#"):
-                if not re.match(r"^#\s*[A-Za-z_][A-Za-z0-9_]*=", line):
-                    comment = line[1:].strip()
-                    if comment:  # Only add non-empty comments
-                        pending_comments.append(comment)
-                continue
-
-            match = re.match(r"^([A-Za-z_][A-Za-z0-9_]*)=(.*)$", line)
-            if match:
-                key, value = match.groups()
-                value = value.strip('"').strip("'")
+        for match in ENV_LINE_RE.finditer(file_path.read_bytes()):
+            key = match.group("key")
+            if key is not None:
+                key = key.decode()
+                value = match.group("value").decode()
+                # Only a matching pair of surrounding quotes is removed
+                if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+                    value = value[1:-1]
                 var_type, processed_value = self.parse_type(value)
 
                 description = None
@@ -112,46 +151,87 @@ class EnvManager:
                     var_type=var_type,
                 )
                 pending_comments = []
+            elif match.group("comment"):  # Only add non-empty comments
+                pending_comments.append(match.group("comment").decode())
+            elif match.group("blank") is not None:
+                pending_comments = []
 
         return env_vars
 
     def is_blocklisted(self, path: Path) -> bool:
         try:
             relative_path = path.relative_to(self.config.start_path)
-            path_str = str(relative_path).replace("\\", "/")
+        except ValueError:
+            return False
+        return self._is_blocklisted_path(str(relative_path).replace("\\", "/"))
 
-            for blocklist_pattern in self.config.blocklist_paths:
-                pattern = blocklist_pattern.replace("\\", "/")
+    def _is_blocklisted_path(self, path_str: str) -> bool:
+        """Check a slash-separated path relative to the start path."""
+        return self._blocklist_re is not None and bool(
+            self._blocklist_re.search(path_str)
+        )
 
-                if (
-                    path_str == pattern
-                    or path_str.startswith(f"{pattern}/")
-                    or f"/{pattern}/" in f"/{path_str}/"
-                ):
-                    return True
+    def _env_files_cache_valid(self) -> bool:
+        if self._env_files_cache is None:
             return False
-        except ValueError:
+        dir_mtimes, _ = self._env_files_cache
+        try:
+            return all(
+                os.stat(dir_path).st_mtime_ns == mtime
+                for dir_path, mtime in dir_mtimes.items()
+            )
+        except OSError:
             return False
 
     def find_env_files(self) -> List[Path]:
+        """Walk the start path once, pruning blocklisted directories early.
+
+        Results are reused until a walked directory's mtime changes, which
+        happens whenever an entry is added, removed or renamed in it.
+        """
+        if self._env_files_cache_valid():
+            return list(self._env_files_cache[1])
+
+        include = compile_globs(self.config.env_patterns)
+        exclude = compile_globs(self.config.exclude_patterns)
+
         env_files = []
-        for pattern in self.config.env_patterns:
-            for path in self.config.start_path.rglob(pattern):
-                if (
-                    path.is_file()
-                    and not any(path.match(exc) for exc in self.config.exclude_patterns)
-                    and not self.is_blocklisted(path)
+        dir_mtimes = {}
+        stack = [(self._start_path_str, "")]
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            try:
+                dir_mtimes[dir_path] = os.stat(dir_path).st_mtime_ns
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            for entry in entries:
+                rel_path = f"{rel_dir}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if not self._is_blocklisted_path(rel_path):
+                        stack.append((entry.path, f"{rel_path}/"))
+                elif (
+                    include.match(entry.name)
+                    and not exclude.match(entry.name)
+                    and entry.is_file()
+                    and not self._is_blocklisted_path(rel_path)
                 ):
-                    env_files.append(path)
-        return sorted(env_files)
+                    env_files.append(Path(entry.path))
+        env_files.sort()
+        self._env_files_cache = (dir_mtimes, env_files)
+        return list(env_files)
 
     def categorize_env_files(self, env_files: List[Path]) -> List[EnvFile]:
         categorized_files = []
-        start_path = self.config.start_path.resolve()
+        # find_env_files returns paths rooted at start_path, so depth follows
+        # from the part counts without resolving anything on disk
+        start_depth = self._start_depth
 
         for idx, file_path in enumerate(env_files, 1):
             service = file_path.parent.name
-            relative_depth = len(file_path.resolve().relative_to(start_path).parts) - 1
+            relative_depth = len(file_path.parts) - start_depth - 1
 
             categorized_files.append(
                 EnvFile(
@@ -159,6 +239,8 @@ class EnvManager:
                     service=service,
                     index=idx,
                     relative_depth=relative_depth,
+                    relative_path=Path(*file_path.parts[start_depth:]),
+                    service_label=service.capitalize(),
                 )
             )
 
@@ -189,18 +271,17 @@ class EnvManager:
             if current_service != env_file.service:
                 current_service = env_file.service
 
-            relative_path = env_file.path.relative_to(self.config.start_path)
             if self.config.show_full_path:
                 table.add_row(
                     str(env_file.index),
-                    Text(env_file.service.capitalize(), style=self.styles["key"]),
-                    Text(str(relative_path), style=self.styles["value"]),
+                    Text(env_file.service_label, style=self.styles["key"]),
+                    Text(str(env_file.relative_path), style=self.styles["value"]),
                     style=row_style,
                 )
             else:
                 table.add_row(
                     str(env_file.index),
-                    Text(env_file.service.capitalize(), style=self.styles["key"]),
+                    Text(env_file.service_label, style=self.styles["key"]),
                     style=row_style,
                 )
 
@@ -258,6 +339,24 @@ class EnvManager:
         return value
 
     def display_vars(self, env_vars: Dict[str, EnvVariable], file_path: Path) -> None:
+        # The edit loop redraws after every prompt, usually with nothing changed
+        cache_key = (
+            file_path,
+            tuple(
+                (var.key, var.value, var.var_type, var.description)
+                for var in env_vars.values()
+            ),
+        )
+        if self._vars_panel_cache is None or self._vars_panel_cache[0] != cache_key:
+            panel = self._build_vars_panel(env_vars, file_path)
+            self._vars_panel_cache = (cache_key, panel)
+
+        self.console.print("\n")
+        self.console.print(self._vars_panel_cache[1])
+
+    def _build_vars_panel(
+        self, env_vars: Dict[str, EnvVariable], file_path: Path
+    ) -> Panel:
         table = Table(
             show_header=True,
             header_style=self.styles["header"],
@@ -290,24 +389,26 @@ class EnvManager:
                 style=row_style,
             )
 
-        self.console.print("\n")
-        self.console.print(
-            Panel(
-                table,
-                title=f"[bold]{file_path.name}[/bold]",
-                subtitle=f"[dim]{file_path.parent}[/dim]",
-                border_style="bright_blue",
-                padding=(0, 0),
-            )
+        return Panel(
+            table,
+            title=f"[bold]{file_path.name}[/bold]",
+            subtitle=f"[dim]{file_path.parent}[/dim]",
+            border_style="bright_blue",
+            padding=(0, 0),
         )
 
     def save_env_file(self, file_path: Path, env_vars: Dict[str, EnvVariable]) -> None:
         content = file_path.read_text()
-        for key, var in env_vars.items():
-            pattern = f"^{re.escape(key)}\\s*=\\s*[^\n]*$"
-            replacement = f"{key}={var.value}"
-
-            content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
+        if env_vars:
+            # Rewrite every assignment in one pass instead of one re.sub per key
+            pattern = re.compile(
+                f"^({'|'.join(map(re.escape, env_vars))})\\s*=\\s*[^\n]*$",
+                flags=re.MULTILINE,
+            )
+            content = pattern.sub(
+                lambda match: f"{match.group(1)}={env_vars[match.group(1)].value}",
+                content,
+            )
 
         file_path.write_text(content)
 
@@ -353,9 +454,10 @@ class EnvManager:
                 selected_file = next(f.path for f in env_files if f.index == selection)
                 env_vars = self.parse_env_file(selected_file)
                 modified = False
+                # Edits only replace values, so key order is fixed for the loop
+                var_keys = list(env_vars)
 
                 while True:
-                    var_keys = list(env_vars.keys())
                     self.display_vars(env_vars, selected_file)
 
                     try:
@@ -378,7 +480,7 @@ class EnvManager:
                         selected_var = env_vars[selected_key]
                         new_value = self.prompt_value(selected_var)
                         if new_value is not None:
-                            env_vars[selected_key].value = new_value
+                            selected_var.value = new_value
                             modified = True
                     except ValueError:
                         self.console.print(
@@ -418,9 +520,11 @@ def main():
     config = EnvManagerConfig(
         debug=os.getenv("ENV_MANAGER_DEBUG", "").lower() == "true",
         show_full_path=os.getenv("ENV_MANAGER_SHOW_PATH", "").lower() == "true",
-        blocklist_paths=[p for p in blocklist if p]
-        if blocklist
-        else EnvManagerConfig.blocklist_paths.default_factory(),
+        blocklist_paths=(
+            [p for p in blocklist if p]
+            if blocklist
+            else EnvManagerConfig.blocklist_paths.default_factory()
+        ),
     )
 
     manager = EnvManager(config)
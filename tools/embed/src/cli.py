@@ -3,11 +3,102 @@ import os
 
 from dotenv import load_dotenv
 
-load_dotenv()
-
 APP_VERSION = os.getenv("APP_VERSION", "[DEV]")
 BUILD_NUMBER = os.getenv("APP_BUILD_NUM", "0")
 
+# Options whose defaults come from the environment, resolved after parsing so
+# that --help and argument errors exit before any .env file is read
+ENV_DEFAULTS = {
+    "es_url": ("ES_URL", "http://localhost:9200"),
+    "es_index": ("ES_INDEX", "default"),
+    "es_basic_auth_user": ("ES_BASIC_AUTH_USERNAME", ""),
+    "es_basic_auth_password": ("ES_BASIC_AUTH_PASSWORD", ""),
+    "ollama_url": ("OLLAMA_URL", "http://localhost:11434"),
+    "embed_batch_size": ("EMBED_BATCH_SIZE", "32"),
+}
+
+
+# File extensions embedded when --extensions is not given
+DEFAULT_EXTENSIONS = frozenset(
+    {
+        # Text files
+        ".txt",
+        ".md",
+        ".rst",
+        ".log",
+        ".csv",
+        ".json",
+        ".yaml",
+        ".yml",
+        # Web development
+        ".html",
+        ".htm",
+        ".css",
+        ".js",
+        ".jsx",
+        ".ts",
+        ".tsx",
+        ".php",
+        # Python
+        ".py",
+        ".pyx",
+        ".pyi",
+        ".ipynb",
+        # C/C++
+        ".c",
+        ".cpp",
+        ".cc",
+        ".cxx",
+        ".h",
+        ".hpp",
+        ".hxx",
+        # Java/Kotlin
+        ".java",
+        ".kt",
+        ".gradle",
+        # C#
+        ".cs",
+        ".csproj",
+        ".cshtml",
+        # Ruby
+        ".rb",
+        ".erb",
+        ".rake",
+        # Shell scripts
+        ".sh",
+        ".bash",
+        ".zsh",
+        # Windows scripts
+        ".bat",
+        ".cmd",
+        ".ps1",
+        ".vbs",
+        ".vbe",
+        ".jse",
+        ".wsf",
+        ".wsh",
+        # Apple scripts
+        ".scpt",
+        ".scptd",
+        ".applescript",
+        # Configuration files
+        ".xml",
+        ".ini",
+        ".conf",
+        ".cfg",
+        ".toml",
+        # QML/Qt
+        ".qml",
+        ".ui",
+        # Rust
+        ".rs",
+        # Go
+        ".go",
+        # Swift
+        ".swift",
+    }
+)
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -25,84 +116,7 @@ def parse_args():
         "--extensions",
         type=str,
         nargs="+",
-        default=[
-            # Text files
-            ".txt",
-            ".md",
-            ".rst",
-            ".log",
-            ".csv",
-            ".json",
-            ".yaml",
-            ".yml",
-            # Web development
-            ".html",
-            ".htm",
-            ".css",
-            ".js",
-            ".jsx",
-            ".ts",
-            ".tsx",
-            ".php",
-            # Python
-            ".py",
-            ".pyx",
-            ".pyi",
-            ".ipynb",
-            # C/C++
-            ".c",
-            ".cpp",
-            ".cc",
-            ".cxx",
-            ".h",
-            ".hpp",
-            ".hxx",
-            # Java/Kotlin
-            ".java",
-            ".kt",
-            ".gradle",
-            # C#
-            ".cs",
-            ".csproj",
-            ".cshtml",
-            # Ruby
-            ".rb",
-            ".erb",
-            ".rake",
-            # Shell scripts
-            ".sh",
-            ".bash",
-            ".zsh",
-            # Windows scripts
-            ".bat",
-            ".cmd",
-            ".ps1",
-            ".vbs",
-            ".vbe",
-            ".js",
-            ".jse",
-            ".wsf",
-            ".wsh",
-            # Apple scripts
-            ".scpt",
-            ".scptd",
-            ".applescript",
-            # Configuration files
-            ".xml",
-            ".ini",
-            ".conf",
-            ".cfg",
-            ".toml",
-            # QML/Qt
-            ".qml",
-            ".ui",
-            # Rust
-            ".rs",
-            # Go
-            ".go",
-            # Swift
-            ".swift",
-        ],
+        default=sorted(DEFAULT_EXTENSIONS),
         help="List of file extensions to process",
     )
 
@@ -122,35 +136,35 @@ def parse_args():
     parser.add_argument(
         "--es-url",
         type=str,
-        default=os.getenv("ES_URL", "http://localhost:9200"),
+        default=None,
         help="URL for the Elasticsearch service",
     )
 
     parser.add_argument(
         "--es-index",
         type=str,
-        default=os.getenv("ES_INDEX", "default"),
+        default=None,
         help="Index for the Elasticsearch service",
     )
 
     parser.add_argument(
         "--es-basic-auth-user",
         type=str,
-        default=os.getenv("ES_BASIC_AUTH_USERNAME", ""),
+        default=None,
         help="Username for the Elasticsearch service authentication",
     )
 
     parser.add_argument(
         "--es-basic-auth-password",
         type=str,
-        default=os.getenv("ES_BASIC_AUTH_PASSWORD", ""),
+        default=None,
         help="Password for the Elasticsearch service authentication",
     )
 
     parser.add_argument(
         "--ollama-url",
         type=str,
-        default=os.getenv("OLLAMA_URL", "http://localhost:11434"),
+        default=None,
         help="URL for the Ollama service",
     )
 
@@ -163,6 +177,13 @@ def parse_args():
         help="Model to use for embeddings",
     )
 
+    parser.add_argument(
+        "--embed-batch-size",
+        type=int,
+        default=None,
+        help="Number of documents sent to the embedding model per request",
+    )
+
     # Text Splitting Configuration
     parser.add_argument(
         "--split-by",
@@ -198,6 +219,21 @@ def parse_args():
         "--stats", action="store_true", default=False, help="Enable statistics logging"
     )
 
+    parser.add_argument(
+        "--show-tree",
+        action="store_true",
+        default=False,
+        help="Log the tree of files to be processed",
+    )
+
     args = parser.parse_args()
 
+    load_dotenv()
+    for dest, (env_var, default) in ENV_DEFAULTS.items():
+        if getattr(args, dest) is None:
+            value = os.getenv(env_var, default)
+            if dest == "embed_batch_size":
+                value = int(value)
+            setattr(args, dest, value)
+
     return args
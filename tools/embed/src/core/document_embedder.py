@@ -1,23 +1,23 @@
 import hashlib
 import logging
+import math
 import os
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 from haystack import Document, Pipeline
-from haystack.components.embedders import (
-    HuggingFaceAPIDocumentEmbedder,
-    HuggingFaceAPITextEmbedder,
-)
 from haystack.components.writers import DocumentWriter
 from haystack.document_stores.types import DuplicatePolicy
-from haystack.utils import Secret
-from haystack_integrations.components.embedders.ollama import (
-    OllamaDocumentEmbedder,
-    OllamaTextEmbedder,
-)
-from haystack_integrations.document_stores.elasticsearch import (
-    ElasticsearchDocumentStore,
-)
+
+# Provider embedders are imported where they are built so a run only loads
+# the integration it actually uses
+if TYPE_CHECKING:
+    from haystack_integrations.document_stores.elasticsearch import (
+        ElasticsearchDocumentStore,
+    )
+
+
+FILE_READ_CHUNK_SIZE = 1 << 20
 
 
 class ModelProvider:
@@ -26,18 +26,23 @@ class ModelProvider:
 
 
 def generate_document_id(file_path: str, content: str) -> str:
-    unique_str = f"{file_path}:{content}"
-    return hashlib.md5(unique_str.encode("utf-8")).hexdigest()
+    # Feed the parts separately to avoid building a concatenated copy
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(file_path.encode("utf-8"))
+    digest.update(b":")
+    digest.update(content.encode("utf-8"))
+    return digest.hexdigest()
 
 
 class DocumentEmbedder:
     def __init__(
         self,
-        document_store: ElasticsearchDocumentStore,
+        document_store: "ElasticsearchDocumentStore",
         model_url: str,
         embedding_model: str,
         provider: str = ModelProvider.OLLAMA,
         hf_api_key: Optional[str] = None,
+        batch_size: int = 32,
     ):
         self.logger = logging.getLogger(__name__)
         self.document_store = document_store
@@ -45,6 +50,7 @@ class DocumentEmbedder:
         self.embedding_model = embedding_model
         self.provider = provider
         self.hf_api_key = hf_api_key
+        self.batch_size = batch_size
         self.embedding_pipeline = None
         self.embedding_dimension = None
 
@@ -64,14 +70,26 @@ class DocumentEmbedder:
             embedding_pipeline = Pipeline()
 
             if self.provider == ModelProvider.OLLAMA:
+                from haystack_integrations.components.embedders.ollama import (
+                    OllamaDocumentEmbedder,
+                )
+
                 document_embedder = OllamaDocumentEmbedder(
-                    model=self.embedding_model, url=self.model_url
+                    model=self.embedding_model,
+                    url=self.model_url,
+                    batch_size=self.batch_size,
                 )
             elif self.provider == ModelProvider.HUGGINGFACE:
+                from haystack.components.embedders import (
+                    HuggingFaceAPIDocumentEmbedder,
+                )
+                from haystack.utils import Secret
+
                 document_embedder = HuggingFaceAPIDocumentEmbedder(
                     api_type="serverless_inference_api",
                     api_params={"model": self.embedding_model},
                     token=Secret.from_token(self.hf_api_key),
+                    batch_size=self.batch_size,
                 )
             else:
                 raise ValueError(f"Unsupported provider: {self.provider}")
@@ -93,10 +111,17 @@ class DocumentEmbedder:
             return self.embedding_dimension
         try:
             if self.provider == ModelProvider.OLLAMA:
+                from haystack_integrations.components.embedders.ollama import (
+                    OllamaTextEmbedder,
+                )
+
                 text_embedder = OllamaTextEmbedder(
                     model=self.embedding_model, url=self.model_url
                 )
             else:
+                from haystack.components.embedders import HuggingFaceAPITextEmbedder
+                from haystack.utils import Secret
+
                 text_embedder = HuggingFaceAPITextEmbedder(
                     api_type="serverless_inference_api",
                     api_params={"model": self.embedding_model},
@@ -112,6 +137,21 @@ class DocumentEmbedder:
             return None
 
     def _validate_or_set_embedding_dimension(self) -> None:
+        # Read the vector size from the index mapping instead of fetching a document
+        try:
+            mappings = self.document_store.client.indices.get_mapping(
+                index=self.document_store._index
+            )
+            for index_mapping in mappings.body.values():
+                properties = index_mapping.get("mappings", {}).get("properties", {})
+                dims = properties.get("embedding", {}).get("dims")
+                if dims:
+                    self.embedding_dimension = dims
+                    self.logger.debug(str(self.embedding_dimension))
+                    return
+        except Exception as e:
+            self.logger.debug(str(e))
+
         try:
             docs = self.document_store._search_documents(size=1)
             if (
@@ -126,23 +166,22 @@ class DocumentEmbedder:
             self.logger.debug(str(e))
 
     def _validate_documents(self, documents: List[Document]) -> List[Document]:
-        valid_documents = []
-        for doc in documents:
-            try:
-                if (
-                    isinstance(doc, Document)
-                    and hasattr(doc, "content")
-                    and doc.content is not None
-                ):
-                    valid_documents.append(doc)
-                else:
-                    self.logger.debug(str(doc))
-            except Exception as e:
-                self.logger.debug(str(e))
+        valid_documents = [
+            doc
+            for doc in documents
+            if isinstance(doc, Document) and getattr(doc, "content", None) is not None
+        ]
+        if len(valid_documents) != len(documents):
+            self.logger.debug(
+                "Skipped %d invalid documents", len(documents) - len(valid_documents)
+            )
         return valid_documents
 
     def embed_documents(
-        self, documents: List[Document], clear_index: bool = False
+        self,
+        documents: List[Document],
+        clear_index: bool = False,
+        pre_validated: bool = False,
     ) -> Dict[str, Any]:
         if clear_index:
             self.logger.warning(
@@ -153,6 +192,7 @@ class DocumentEmbedder:
             "success": False,
             "documents_processed": 0,
             "documents_failed": 0,
+            "batches": 0,
             "error": None,
         }
 
@@ -161,7 +201,10 @@ class DocumentEmbedder:
             embedding_result["error"] = "No documents provided"
             return embedding_result
 
-        valid_documents = self._validate_documents(documents)
+        # Documents built by embed_files always have content, so skip the pass
+        valid_documents = (
+            documents if pre_validated else self._validate_documents(documents)
+        )
         if not valid_documents:
             self.logger.debug("No valid documents found after validation")
             embedding_result["error"] = "No valid documents"
@@ -175,34 +218,81 @@ class DocumentEmbedder:
                 embedding_result["documents_failed"] = len(valid_documents)
                 return embedding_result
 
+        self.logger.debug(
+            "Attempting to embed %d documents in %d batches",
+            len(valid_documents),
+            math.ceil(len(valid_documents) / self.batch_size),
+        )
+        # Run the pipeline per batch so each batch is written before the next
+        # one is embedded, keeping only one batch of embeddings in flight
+        processed = 0
         try:
-            self.logger.debug(f"Attempting to embed {len(valid_documents)} documents")
-            self.embedding_pipeline.run({"embedder": {"documents": valid_documents}})
+            for start in range(0, len(valid_documents), self.batch_size):
+                end = start + self.batch_size
+                batch = valid_documents[start:end]
+                self.embedding_pipeline.run({"embedder": {"documents": batch}})
+                processed += len(batch)
+                embedding_result["batches"] += 1
             embedding_result["success"] = True
-            embedding_result["documents_processed"] = len(valid_documents)
-            embedding_result["documents_failed"] = len(documents) - len(valid_documents)
         except Exception as e:
             self.logger.debug(str(e))
             embedding_result["error"] = str(e)
-            embedding_result["documents_failed"] = len(valid_documents)
 
+        embedding_result["documents_processed"] = processed
+        embedding_result["documents_failed"] = len(documents) - processed
         return embedding_result
 
     def embed_files(
-        self, file_paths: List[str], clear_index: bool = False
+        self,
+        file_paths: List[Union[str, Tuple[str, str]]],
+        clear_index: bool = False,
     ) -> Dict[str, Any]:
+        """Embed files given as paths or as (path, filename) pairs from a scan."""
         documents = []
-        for file_path in file_paths:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                doc_id = generate_document_id(file_path, content)
-                doc = Document(
-                    id=doc_id,
-                    content=content,
-                    meta={"filename": os.path.basename(file_path)},
-                )
-                documents.append(doc)
-            except Exception as e:
-                self.logger.debug(str(e))
-        return self.embed_documents(documents, clear_index=clear_index)
+        if file_paths:
+            # File reads and hashing release the GIL, so overlap them across threads
+            with ThreadPoolExecutor(max_workers=min(32, len(file_paths))) as executor:
+                documents = [
+                    doc
+                    for doc in executor.map(self._try_build_file_document, file_paths)
+                    if doc is not None
+                ]
+        return self.embed_documents(
+            documents, clear_index=clear_index, pre_validated=True
+        )
+
+    def _try_build_file_document(
+        self, file: Union[str, Tuple[str, str]]
+    ) -> Optional[Document]:
+        try:
+            if isinstance(file, tuple):
+                return self._build_file_document(*file)
+            return self._build_file_document(file, os.path.basename(file))
+        except Exception as e:
+            self.logger.debug(str(e))
+            return None
+
+    def _build_file_document(self, file_path: str, filename: str) -> Document:
+        # Hash the raw bytes while reading so the ID needs no second pass
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(file_path.encode("utf-8"))
+        digest.update(b":")
+        buffer = bytearray()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(FILE_READ_CHUNK_SIZE):
+                digest.update(chunk)
+                buffer += chunk
+
+        content = buffer.decode("utf-8")
+        if "\r" in content:
+            # Keep text-mode newline handling; the ID is then over the normalized text
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+            doc_id = generate_document_id(file_path, content)
+        else:
+            doc_id = digest.hexdigest()
+
+        return Document(
+            id=doc_id,
+            content=content,
+            meta={"filename": filename},
+        )
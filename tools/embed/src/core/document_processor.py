@@ -1,17 +1,70 @@
 import json
 import logging
-from collections import defaultdict
+import math
+import multiprocessing
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-from haystack import Pipeline
+from haystack import Document, Pipeline
 from haystack.components.converters.txt import TextFileToDocument
 from haystack.components.preprocessors import DocumentCleaner, DocumentSplitter
-from haystack.components.writers import DocumentWriter
-from haystack.document_stores.in_memory import InMemoryDocumentStore
-from haystack.document_stores.types import DuplicatePolicy
+from haystack.dataclasses import ByteStream
+
+# Below this many top-level directories a thread pool costs more than it saves
+PARALLEL_SCAN_MIN_DIRS = 4
+# Files read and preprocessed together; each batch is one worker task
+PREPROCESS_BATCH_SIZE = 128
+
+
+def build_preprocessing_pipeline(
+    split_by: str, split_length: int, split_overlap: int, split_threshold: int
+) -> Pipeline:
+    pipeline = Pipeline()
+    pipeline.add_component(
+        instance=TextFileToDocument(store_full_path=False), name="converter"
+    )
+    pipeline.add_component(
+        instance=DocumentCleaner(
+            ascii_only=True,
+            remove_empty_lines=True,
+            remove_extra_whitespaces=True,
+        ),
+        name="cleaner",
+    )
+    pipeline.add_component(
+        instance=DocumentSplitter(
+            split_by=split_by,
+            split_length=split_length,
+            split_overlap=split_overlap,
+            split_threshold=split_threshold,
+        ),
+        name="splitter",
+    )
+
+    pipeline.connect("converter.documents", "cleaner.documents")
+    pipeline.connect("cleaner.documents", "splitter.documents")
+    return pipeline
+
+
+# Each worker process builds its own pipeline once, in the pool initializer
+_worker_pipeline: Optional[Pipeline] = None
+
+
+def _init_preprocess_worker(split_options: Dict[str, Any]) -> None:
+    global _worker_pipeline
+    _worker_pipeline = build_preprocessing_pipeline(**split_options)
+
+
+def _preprocess_batch(
+    sources: List[ByteStream], meta: Dict[str, Any]
+) -> List[Document]:
+    result = _worker_pipeline.run({"converter": {"sources": sources, "meta": meta}})
+    return result["splitter"]["documents"]
 
 
 @dataclass
@@ -23,7 +76,7 @@ class ProcessingStats:
     skipped_files: int = 0
     total_file_size: int = 0
     split_documents: int = 0
-    blocklisted_files: int = 0
+    blocklisted_paths: int = 0
 
 
 class DocumentProcessor:
@@ -37,110 +90,231 @@ class DocumentProcessor:
         split_overlap: int = 20,
         split_threshold: int = 5,
         log_level: int = logging.INFO,
+        enable_tree_log: bool = False,
     ):
         self.base_path = Path(base_path)
-        self.file_extensions = [
-            ext.lower() if ext.startswith(".") else f".{ext.lower()}"
-            for ext in file_extensions
-        ]
-        self.blocklist = blocklist or set()
+        # Deduplicate so a repeated extension is not searched and loaded twice
+        self.file_extensions = list(
+            dict.fromkeys(
+                ext.lower() if ext.startswith(".") else f".{ext.lower()}"
+                for ext in file_extensions
+            )
+        )
+        # Every discovered file name is tested against all suffixes at once
+        self._suffixes = tuple(self.file_extensions)
+        # Frozen copy: scan threads read it, and the caller's set may change
+        self.blocklist = frozenset(blocklist or ())
+        self.enable_tree_log = enable_tree_log
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.logger.setLevel(log_level)
 
-        # Log initialization configuration
-        config = {
-            "base_path": str(self.base_path),
-            "file_extensions": self.file_extensions,
-            "blocklist": sorted(self.blocklist),
+        self._split_options = {
             "split_by": split_by,
             "split_length": split_length,
             "split_overlap": split_overlap,
             "split_threshold": split_threshold,
         }
-        self.logger.info(
-            "Document processor configuration: %s", json.dumps(config, indent=None)
-        )
 
-        self.document_store = InMemoryDocumentStore()
-        self.converter = TextFileToDocument(store_full_path=False)
-        self.cleaner = DocumentCleaner(
-            ascii_only=True,
-            remove_empty_lines=True,
-            remove_extra_whitespaces=True,
-        )
-        self.splitter = DocumentSplitter(
-            split_by=split_by,
-            split_length=split_length,
-            split_overlap=split_overlap,
-            split_threshold=split_threshold,
-        )
-        self.writer = DocumentWriter(
-            document_store=self.document_store, policy=DuplicatePolicy.OVERWRITE
+        # Log initialization configuration, serializing it only if it is emitted
+        if self.logger.isEnabledFor(logging.INFO):
+            config = {
+                "base_path": str(self.base_path),
+                "file_extensions": self.file_extensions,
+                "blocklist": sorted(self.blocklist),
+                **self._split_options,
+            }
+            self.logger.info(
+                "Document processor configuration: %s", json.dumps(config, indent=None)
+            )
+        self.preprocessing_pipeline = build_preprocessing_pipeline(
+            **self._split_options
         )
 
-        self.indexing_pipeline = Pipeline()
-        self.indexing_pipeline.add_component(instance=self.converter, name="converter")
-        self.indexing_pipeline.add_component(instance=self.cleaner, name="cleaner")
-        self.indexing_pipeline.add_component(instance=self.splitter, name="splitter")
-        self.indexing_pipeline.add_component(instance=self.writer, name="writer")
-
-        self.indexing_pipeline.connect("converter.documents", "cleaner.documents")
-        self.indexing_pipeline.connect("cleaner.documents", "splitter.documents")
-        self.indexing_pipeline.connect("splitter.documents", "writer.documents")
-
-    def _build_tree_structure(self, files: List[Path]) -> Dict:
-        tree = {}
-        for file in sorted(files):
-            relative_path = file.relative_to(self.base_path)
-            parts = list(relative_path.parts)
-
-            # Navigate/create the tree structure
-            current = tree
-            for part in parts[:-1]:  # Process all but the last part (directories)
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-                if current is None:  # Safety check
-                    current = {}
-
-            # Add the file as a leaf node
-            if parts:  # Safety check
-                current[parts[-1]] = None
-
-        return tree
-
-    def _print_tree(
-        self, tree: Dict, prefix: str = "", is_last: bool = True
-    ) -> List[str]:
-        if tree is None:
-            return []
+    def _format_tree(self, files: List[Path]) -> List[str]:
+        """Render files as tree lines from their sorted relative parts."""
+        # Discovered paths are rooted at base_path, so slicing their parts is
+        # equivalent to relative_to() without re-parsing each path
+        base_depth = len(self.base_path.parts)
+        rows = sorted(file.parts[base_depth:] for file in files)
+
+        # Depth at which each row first differs from the previous one; nodes
+        # above it were already printed for an earlier row
+        starts = [0] * len(rows)
+        for i in range(1, len(rows)):
+            depth = 0
+            for prev_part, part in zip(rows[i - 1], rows[i]):
+                if prev_part != part:
+                    break
+                depth += 1
+            starts[i] = depth
+
+        # Walk backwards to learn which nodes still have a sibling below them
+        last_flags = [None] * len(rows)
+        has_later_sibling: List[bool] = []
+        for i in range(len(rows) - 1, -1, -1):
+            start = starts[i]
+            last_flags[i] = [
+                not (depth < len(has_later_sibling) and has_later_sibling[depth])
+                for depth in range(start, len(rows[i]))
+            ]
+            has_later_sibling = has_later_sibling[:start]
+            has_later_sibling += [False] * (start - len(has_later_sibling)) + [True]
 
         tree_lines = []
-        items = list(tree.items() if isinstance(tree, dict) else [])
-
-        for i, (name, subtree) in enumerate(items):
-            is_last_item = i == len(items) - 1
-            icon = "└── " if is_last_item else "├── "
-            tree_lines.append(f"{prefix}{icon}{name}")
-
-            if isinstance(subtree, dict):
-                extension = "    " if is_last_item else "│   "
-                subtree_lines = self._print_tree(
-                    subtree, prefix + extension, is_last_item
-                )
-                tree_lines.extend(subtree_lines)
+        prefixes = [""]
+        for row, start, flags in zip(rows, starts, last_flags):
+            for depth, (name, is_last) in enumerate(zip(row[start:], flags), start):
+                icon = "└── " if is_last else "├── "
+                tree_lines.append(f"{prefixes[depth]}{icon}{name}")
+                keep = depth + 1
+                del prefixes[keep:]
+                prefixes.append(prefixes[depth] + ("    " if is_last else "│   "))
 
         return tree_lines
 
-    def _is_blocklisted(self, path: Path) -> bool:
-        blocklisted_parts = [part for part in path.parts if part in self.blocklist]
-        is_blocklisted = len(blocklisted_parts) > 0
+    def _scan_dir(
+        self,
+        dir_path: str,
+        found: List[Tuple[Path, int]],
+        blocklisted: List[Path],
+    ) -> List[str]:
+        """Scan one directory, returning the subdirectories left to descend."""
+        subdirs = []
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                # Blocklisted directories are pruned here, so nothing under
+                # them is ever read
+                if entry.name in self.blocklist:
+                    blocklisted.append(Path(entry.path))
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.lower().endswith(self._suffixes) and entry.is_file():
+                    # The DirEntry caches its stat, so sizing costs no extra pass
+                    found.append((Path(entry.path), entry.stat().st_size))
+        return subdirs
+
+    def _scan_tree(self, root: str) -> Tuple[List[Tuple[Path, int]], List[Path]]:
+        found = []
+        blocklisted = []
+        stack = [root]
+        while stack:
+            dir_path = stack.pop()
+            try:
+                stack.extend(self._scan_dir(dir_path, found, blocklisted))
+            except OSError as e:
+                self.logger.error("Error scanning %s: %s", dir_path, str(e))
+        return found, blocklisted
+
+    def _discover_files(self) -> Tuple[List[Path], int, List[Path]]:
+        """Walk the base path once, matching every extension in the same pass.
+
+        Returns the matching files, their total size in bytes and the
+        blocklisted paths that were skipped.
+        """
+        found = []
+        blocklisted = []
+        subdirs = self._scan_dir(str(self.base_path), found, blocklisted)
+
+        if len(subdirs) > PARALLEL_SCAN_MIN_DIRS:
+            # Directory reads block in the kernel, so subtrees scan concurrently
+            with ThreadPoolExecutor(max_workers=min(32, len(subdirs))) as executor:
+                results = list(executor.map(self._scan_tree, subdirs))
+        else:
+            results = [self._scan_tree(subdir) for subdir in subdirs]
+
+        for subtree_found, skipped in results:
+            found.extend(subtree_found)
+            blocklisted.extend(skipped)
+
+        found.sort()
+        files = [path for path, _ in found]
+        total_size = sum(size for _, size in found)
+        return files, total_size, blocklisted
+
+    def _read_source(self, path: Path) -> Optional[ByteStream]:
+        try:
+            # Same metadata the converter attaches when it opens the path itself
+            return ByteStream.from_file_path(path, meta={"file_path": str(path)})
+        except OSError as e:
+            self.logger.warning("Could not read %s: %s", path, str(e))
+            return None
+
+    def _read_sources(self, files: List[Path]) -> List[ByteStream]:
+        """Read files concurrently so their I/O latency overlaps."""
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+            return [
+                source
+                for source in executor.map(self._read_source, files)
+                if source is not None
+            ]
+
+    def _iter_source_batches(
+        self, files: List[Path]
+    ) -> Iterator[Tuple[List[Path], List[ByteStream]]]:
+        """Yield read batches, reading the next one while the caller works."""
+        batches = []
+        for start in range(0, len(files), PREPROCESS_BATCH_SIZE):
+            end = start + PREPROCESS_BATCH_SIZE
+            batches.append(files[start:end])
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(self._read_sources, batches[0])
+            for batch, next_batch in zip(batches, batches[1:] + [None]):
+                sources = pending.result()
+                if next_batch is not None:
+                    pending = prefetcher.submit(self._read_sources, next_batch)
+                yield batch, sources
+
+    def _preprocess(
+        self, files: List[Path], meta: Dict[str, Any], stats: ProcessingStats
+    ) -> List[Document]:
+        """Read, convert, clean and split files batch by batch."""
+        documents = []
+        batch_count = math.ceil(len(files) / PREPROCESS_BATCH_SIZE)
+        workers = min(os.cpu_count() or 1, batch_count)
+
+        if workers <= 1:
+            for batch, sources in self._iter_source_batches(files):
+                stats.skipped_files += len(batch) - len(sources)
+                stats.processed_files += len(sources)
+                result = self.preprocessing_pipeline.run(
+                    {"converter": {"sources": sources, "meta": meta}}
+                )
+                documents.extend(result["splitter"]["documents"])
+            return documents
 
-        if is_blocklisted:
-            self.logger.debug(
-                "Blocklisted path: %s (matched: %s)", path, blocklisted_parts
-            )
-        return is_blocklisted
+        # Cleaning and splitting are CPU-bound Python, so use processes; each
+        # batch is submitted as soon as it is read so reads overlap the work
+        self.logger.info(
+            "Preprocessing %d files in %d batches across %d processes",
+            len(files),
+            batch_count,
+            workers,
+        )
+        # The reader threads are already running when workers start, so they
+        # must not be forked from this process
+        start_method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        # Bound queued batches so read-ahead cannot pull the corpus into memory
+        max_in_flight = 2 * workers
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_preprocess_worker,
+            initargs=(self._split_options,),
+        ) as executor:
+            pending = deque()
+            for batch, sources in self._iter_source_batches(files):
+                stats.skipped_files += len(batch) - len(sources)
+                stats.processed_files += len(sources)
+                if len(pending) >= max_in_flight:
+                    documents.extend(pending.popleft().result())
+                pending.append(executor.submit(_preprocess_batch, sources, meta))
+            while pending:
+                documents.extend(pending.popleft().result())
+        return documents
 
     def _log_processing_summary(self, stats: ProcessingStats):
         """Log a summary of the processing results."""
@@ -151,7 +325,7 @@ class DocumentProcessor:
             f"Split Documents: {stats.split_documents}",
             f"Failed Files: {stats.failed_files}",
             f"Skipped Files: {stats.skipped_files}",
-            f"Blocklisted Files: {stats.blocklisted_files}",
+            f"Blocklisted Paths: {stats.blocklisted_paths}",
         ]
 
         if stats.total_file_size > 0:
@@ -174,111 +348,54 @@ class DocumentProcessor:
 
         self.logger.info("Starting file search...")
 
-        files = []
-        blocklisted_files = []
-        blocklist_stats = {}
-        current_directory = None
+        try:
+            files, stats.total_file_size, blocklisted = self._discover_files()
+        except Exception as e:
+            self.logger.error("Error searching for files: %s", str(e))
+            files, blocklisted = [], []
 
-        for idx, ext in enumerate(self.file_extensions, 1):
-            self.logger.info(
-                "Searching [%d/%d]: *%s", idx, len(self.file_extensions), ext
-            )
-            try:
-                found_files = list(self.base_path.rglob(f"*{ext}"))
-                current_found = len(found_files)
-                if current_found > 0:
-                    self.logger.info(
-                        "Found %d files with extension %s", current_found, ext
-                    )
-
-                valid_files = []
-                blocklist_details = defaultdict(list)  # Track blocklist reasons
-
-                for file in found_files:
-                    # Show directory changes for better context
-                    file_dir = file.parent
-                    if file_dir != current_directory:
-                        current_directory = file_dir
-                        if self.logger.level <= logging.DEBUG:
-                            self.logger.debug(
-                                "Scanning: %s", file_dir.relative_to(self.base_path)
-                            )
-
-                    if self._is_blocklisted(file):
-                        blocklist_reason = next(
-                            part for part in file.parts if part in self.blocklist
-                        )
-                        blocklist_details[blocklist_reason].append(file)
-                        blocklist_stats[blocklist_reason] = (
-                            blocklist_stats.get(blocklist_reason, 0) + 1
-                        )
-                        stats.blocklisted_files += 1
-                        blocklisted_files.append(file)
-                    else:
-                        valid_files.append(file)
-
-                if blocklist_details:
-                    self.logger.info("Blocklisted files:")
-                    for reason, blocklisted in blocklist_details.items():
-                        self.logger.info(
-                            "  %d files in '%s' directories", len(blocklisted), reason
-                        )
-                        if self.logger.level <= logging.DEBUG:
-                            for bf in blocklisted[:5]:
-                                self.logger.debug(
-                                    "    - %s", bf.relative_to(self.base_path)
-                                )
-                            if len(blocklisted) > 5:
-                                self.logger.debug(
-                                    "    ... and %d more", len(blocklisted) - 5
-                                )
-
-                files.extend(valid_files)
-
-            except Exception as e:
-                self.logger.error("Error searching for %s files: %s", ext, str(e))
-                continue
+        blocklist_details = defaultdict(list)  # Track blocklist reasons
+        for path in blocklisted:
+            blocklist_details[path.name].append(path)
+        stats.blocklisted_paths = len(blocklisted)
 
         total_files = len(files)
         self.logger.info("Summary: Found %d files to process", total_files)
 
-        if blocklist_stats:
+        if blocklist_details:
             self.logger.info("Blocklist summary:")
-            for pattern, count in sorted(
-                blocklist_stats.items(), key=lambda x: x[1], reverse=True
+            for pattern, paths in sorted(
+                blocklist_details.items(), key=lambda x: len(x[1]), reverse=True
             ):
-                self.logger.info("  %d files skipped due to '%s'", count, pattern)
+                self.logger.info("  %d paths skipped due to '%s'", len(paths), pattern)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    for bp in paths[:5]:
+                        self.logger.debug("    - %s", bp.relative_to(self.base_path))
+                    if len(paths) > 5:
+                        self.logger.debug("    ... and %d more", len(paths) - 5)
 
         if files:
-            self.logger.info("Files to be processed:")
-            tree = self._build_tree_structure(files)
-            tree_output = self._print_tree(tree)
-            self.logger.info(".")  # root
-            for line in tree_output:
-                self.logger.info(line)
+            # Rendering the tree is O(files), so only do it when it is shown
+            if self.enable_tree_log and self.logger.isEnabledFor(logging.INFO):
+                tree_output = self._format_tree(files)
+                self.logger.info(
+                    "Files to be processed:\n.\n%s", "\n".join(tree_output)
+                )
 
             try:
-                for file_path in files:
-                    stats.total_file_size += file_path.stat().st_size
-
-                self.indexing_pipeline.run(
-                    {
-                        "converter": {
-                            "sources": files,
-                            "meta": {
-                                "processed_at": datetime.now().isoformat(),
-                            },
-                        }
-                    }
+                documents = self._preprocess(
+                    files, {"processed_at": datetime.now().isoformat()}, stats
                 )
+                # Deduplicate by ID with the overwrite semantics the in-memory
+                # store had, without holding a second copy of every document
+                documents = list({doc.id: doc for doc in documents}.values())
 
-                stats.processed_files = len(files)
-                stats.total_documents = len(self.document_store.filter_documents())
+                stats.total_documents = len(documents)
                 stats.split_documents = stats.total_documents
 
                 self._log_processing_summary(stats)
 
-                return self.document_store.filter_documents()
+                return documents
 
             except Exception as e:
                 stats.failed_files += 1
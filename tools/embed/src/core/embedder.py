@@ -1,7 +1,7 @@
 import logging
 import os
+import time
 from dataclasses import dataclass
-from datetime import datetime
 from typing import List, Optional
 
 import requests
@@ -22,6 +22,7 @@ class PipelineConfig:
     es_basic_auth_password: Optional[str] = None
     ollama_url: Optional[str] = None
     hf_api_key: Optional[str] = None
+    embed_batch_size: int = 32
 
     def __post_init__(self):
         if self.provider not in [ModelProvider.OLLAMA, ModelProvider.HUGGINGFACE]:
@@ -77,6 +78,7 @@ class RAGEmbedder:
         es_basic_auth_password: str = None,
         ollama_url: str = None,
         hf_api_key: str = None,
+        embed_batch_size: int = None,
     ):
         logging.basicConfig(
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -109,6 +111,8 @@ class RAGEmbedder:
             or os.getenv("ES_BASIC_AUTH_PASSWORD"),
             ollama_url=ollama_url or os.getenv("OLLAMA_URL"),
             hf_api_key=hf_api_key or os.getenv("HF_API_KEY"),
+            embed_batch_size=embed_batch_size
+            or int(os.getenv("EMBED_BATCH_SIZE", "32")),
         )
 
         self._log_configuration()
@@ -222,7 +226,7 @@ class RAGEmbedder:
             raise
 
     def embed_documents(self, documents: List[Document]) -> None:
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         total_chars = sum(len(doc.content) for doc in documents)
 
         self.logger.info("Starting document embedding process:")
@@ -236,10 +240,12 @@ class RAGEmbedder:
                 embedding_model=self.config.embedding_model,
                 provider=self.config.provider,
                 hf_api_key=self.config.hf_api_key,
+                batch_size=self.config.embed_batch_size,
             )
-            embedder.embed_documents(documents)
+            result = embedder.embed_documents(documents)
+            self.logger.info(f"- Embedding batches: {result['batches']}")
 
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start_time
             self.logger.info("Document embedding completed:")
             self.logger.info(f"- Execution time: {execution_time:.2f} seconds")
             self.logger.info(
@@ -45,6 +45,7 @@ def log_args(args):
         "Elasticsearch URL": args.es_url,
         "Ollama URL": args.ollama_url,
         "Embedding Model": args.embedding_model,
+        "Embedding Batch Size": args.embed_batch_size,
         "Document Path": args.path or "Not specified",
         "File Extensions": ", ".join(args.extensions),
         "Debug Mode": args.debug,
@@ -65,6 +66,7 @@ def process_documents(args) -> List[Document]:
         split_length=args.split_length,
         split_overlap=args.split_overlap,
         split_threshold=args.split_threshold,
+        enable_tree_log=args.show_tree,
     )
     documents = processor.process_files()
     logger.info(f"Processed {len(documents)} documents")
@@ -89,6 +91,7 @@ def main():
             es_basic_auth_user=args.es_basic_auth_user,
             es_basic_auth_password=args.es_basic_auth_password,
             embedding_model=args.embedding_model,
+            embed_batch_size=args.embed_batch_size,
         )
         logger.debug("RAG Embedder initialized successfully")
 